@@ -244,8 +244,10 @@ class CSVArchiveParser:
         line_count = sum(1 for row in csv_rows if len(row) > 0 and row[0] == "LineItem_OrderLine")
         scenario.number_of_lines = line_count
         
-        # Update csv_design with full CSV content
+        # Update csv_design with full CSV content; keep its parsed rows so
+        # CSV test files can be regenerated without reading it again
         scenario.csv_design = csv_content
+        scenario.csv_rows = csv_rows
         # Store CSV design filename if provided
         if csv_filename is not None:
             scenario.csv_design_filename = csv_filename
@@ -281,9 +283,7 @@ class CSVArchiveParser:
         if not tli_rows:
             # No TLI rows, return original content as CSV
             output = io.StringIO()
-            writer = csv.writer(output)
-            for row in csv_rows:
-                writer.writerow(row)
+            csv.writer(output).writerows(csv_rows)
             return output.getvalue()
         
         # Check if number of items matches number of empty values in each TLI row
@@ -300,8 +300,9 @@ class CSVArchiveParser:
                     )
                 )
         
-        # Create a copy of CSV rows for modification
-        result_rows = [row[:] for row in csv_rows]
+        # Shallow copy of the row list: only TLI rows are replaced (by new
+        # lists below), all other rows are written unchanged
+        result_rows = list(csv_rows)
         
         # Process each TLI row - each row should be filled with all items
         for tli_row_idx, (original_idx, tli_row) in enumerate(tli_rows):
@@ -329,8 +330,7 @@ class CSVArchiveParser:
         # Convert back to CSV string (with proper line endings)
         output = io.StringIO()
         writer = csv.writer(output, lineterminator='\n')
-        for row in result_rows:
-            writer.writerow(row)
+        writer.writerows(result_rows)
         
         # Remove any trailing newline if present
         result = output.getvalue()
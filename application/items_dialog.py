@@ -41,31 +41,6 @@ class ItemsInfoDialog(QDialog):
         self.setMinimumSize(960, 780)
         self._create_ui()
 
-    def _wrap_text(self, text: str, max_length: int = 30) -> str:
-        """Wrap text to multiple lines if it exceeds max_length"""
-        if len(text) <= max_length:
-            return text
-
-        words = text.split()
-        lines: list[str] = []
-        current_line = ""
-
-        for word in words:
-            if len(current_line) + len(word) + 1 <= max_length:
-                if current_line:
-                    current_line += " " + word
-                else:
-                    current_line = word
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-
-        if current_line:
-            lines.append(current_line)
-
-        return "\n".join(lines)
-
     def _create_ui(self) -> None:
         layout = QVBoxLayout(self)
 
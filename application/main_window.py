@@ -1,16 +1,26 @@
 """Main window module for the application"""
 
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
 
 import copy
 import csv
+import functools
 import io
 import re
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
+
+# lxml is optional: it keeps the RSX tree in C, but the stdlib ElementTree is used when it is missing
+try:
+    from lxml import etree as ET
+    _LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _LXML_AVAILABLE = False
 
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QIcon, QPixmap
+from PyQt6.QtGui import QColor, QFont, QIcon, QPainter, QPixmap
 from PyQt6.QtWidgets import (
     QCheckBox,
     QComboBox,
@@ -58,9 +68,167 @@ from application.code_generators import (
 )
 
 
+# Application folder (config, database and window icons live here)
+APP_DIR = Path(__file__).parent
+ICON_ICO_PATH = APP_DIR / "icon.ico"
+ICON_PNG_PATH = APP_DIR / "icon.png"
+
+# Parse status buttons (object name "parseStatusButton"): subtle green (parseState="ok")
+# or red (parseState="error") style, parsed once as part of the main window stylesheet
+STATUS_BUTTON_STYLE = """
+    QPushButton#parseStatusButton {
+        font-weight: bold;
+        font-size: 16px;
+        border: none;
+        border-radius: 3px;
+        padding: 2px;
+    }
+    QPushButton#parseStatusButton[parseState="ok"] {
+        background-color: #e8f5e9;
+        color: #2e7d32;
+    }
+    QPushButton#parseStatusButton[parseState="ok"]:hover {
+        background-color: #c8e6c9;
+    }
+    QPushButton#parseStatusButton[parseState="ok"]:pressed {
+        background-color: #a5d6a7;
+    }
+    QPushButton#parseStatusButton[parseState="error"] {
+        background-color: #ffebee;
+        color: #c62828;
+    }
+    QPushButton#parseStatusButton[parseState="error"]:hover {
+        background-color: #ffcdd2;
+    }
+    QPushButton#parseStatusButton[parseState="error"]:pressed {
+        background-color: #ef9a9a;
+    }
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _default_app_icon() -> QIcon:
+    """Paint (once) the default window icon used when icon.ico/icon.png are missing."""
+    pixmap = QPixmap(32, 32)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    # Draw a simple "T" letter as default icon
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.fillRect(0, 0, 32, 32, QColor(33, 150, 243))  # Blue background
+    painter.setPen(QColor(255, 255, 255))  # White text
+    font = QFont()
+    font.setPointSize(20)
+    font.setBold(True)
+    painter.setFont(font)
+    painter.drawText(0, 0, 32, 32, Qt.AlignmentFlag.AlignCenter, "T")
+    painter.end()
+    return QIcon(pixmap)
+
+
+@functools.lru_cache(maxsize=None)
+def _rsx_element_path(path_parts: Tuple[str, ...]) -> str:
+    """Build (once per distinct path) an ElementPath expression matching RSX path parts by local tag name."""
+    return "/".join("{*}" + part for part in path_parts)
+
+
+@functools.lru_cache(maxsize=None)
+def _decimal_format(decimals: int) -> str:
+    """Return (once per precision) a format string with the given number of decimal places."""
+    return f"{{:.{decimals}f}}"
+
+
+def _local_name(tag: str) -> str:
+    """Return the tag name without its "{namespace}" prefix."""
+    return tag[tag.rfind("}") + 1 :]
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_xpath(expr: str):
+    """Compile (once per distinct expression) an lxml XPath; only used when lxml is available."""
+    return ET.XPath(expr)
+
+
+def _children_with_local_name(parent: ET.Element, name: str) -> List[ET.Element]:
+    """Return the element children of parent whose local tag name is name, in document order."""
+    if _LXML_AVAILABLE:
+        # One precompiled XPath for every name; the name is bound as a variable
+        return _compiled_xpath("*[local-name() = $name]")(parent, name=name)
+    return [child for child in parent if isinstance(child.tag, str) and _local_name(child.tag) == name]
+
+
+def _clone_element(elem: ET.Element) -> ET.Element:
+    """Return a deep copy of an RSX element (template LineItem, ItemLevel, Extra Record repeat, ...).
+
+    lxml copies subtrees in C, so copy.deepcopy is used there. For the stdlib
+    ElementTree the subtree is rebuilt directly, which skips deepcopy's memo
+    bookkeeping and is noticeably faster for LineItem-sized templates.
+    """
+    if _LXML_AVAILABLE:
+        return copy.deepcopy(elem)
+    clone = ET.Element(elem.tag, dict(elem.attrib))
+    clone.text = elem.text
+    clone.tail = elem.tail
+    clone.extend([_clone_element(child) for child in elem])
+    return clone
+
+
+def _draft_comment(text: str) -> ET.Element:
+    """Return a comment node holding a commented-out draft element.
+
+    XML comments may not contain "--" or end with "-" (lxml raises ValueError
+    for such text), and values such as PurchaseOrderNumber come from input
+    files, so those dashes are separated by a space.
+    """
+    while "--" in text:
+        text = text.replace("--", "- -")
+    if text.endswith("-"):
+        text += " "
+    return ET.Comment(text)
+
+
+@functools.lru_cache(maxsize=8192)
+def _split_rsx(path: str, doc_root_name: str) -> Tuple[str, ...]:
+    """Split an RSX path into tag parts (once per distinct path), dropping the document root tag."""
+    parts = Item.rsx_path_parts(path)
+    if parts and parts[0] == doc_root_name:
+        return parts[1:]
+    return parts
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_rsx_parent(path: str, doc_root_name: str) -> Tuple[str, ...]:
+    """Return (as one shared tuple per distinct path) the parent parts of an RSX path, without the last tag."""
+    return _split_rsx(path, doc_root_name)[:-1]
+
+
+@functools.lru_cache(maxsize=4096)
+def _rsx_parts_after(path_parts: Tuple[str, ...], container: str) -> Tuple[str, ...]:
+    """Return (once per distinct path and container) the parts after container, or all parts if it is absent."""
+    try:
+        return path_parts[path_parts.index(container) + 1 :]
+    except ValueError:
+        return path_parts
+
+
 class MainWindow(QMainWindow):
     """Main application window"""
 
+    # Structural RSX elements collected by _index_document
+    INDEXED_RSX_TAGS = ("LineItem", "ItemLevel", "OrderLevel", "PackLevel")
+
+    # Minimal number of CSV test files generated/written through a thread pool
+    CSV_PARALLEL_WRITE_THRESHOLD = 8
+
+    # Fixed 810 blocks filled after LineItem cloning (first occurrence of each tag)
+    FIXED_810_BLOCK_TAGS = ("ChargesAllowances", "Taxes", "Summary")
+
+    # RSX document code -> (document root tag, Item RSX path attribute, Item sub-parts attribute)
+    RSX_DOC_TYPES = {
+        "855": ("OrderAck", "rsx_path_855", "rsx_855_sub_parts"),
+        "856": ("Shipment", "rsx_path_856", "rsx_856_sub_parts"),
+        "810": ("Invoice", "rsx_path_810", "rsx_810_sub_parts"),
+    }
+
     def __init__(self, base_path: Path) -> None:
         """
         Initialize MainWindow
@@ -116,19 +284,39 @@ class MainWindow(QMainWindow):
         # Initialize artifact checkboxes list (will be populated in create_ui)
         self.artifact_checkboxes: List = []
 
+        # Per-document index of RSX elements (filled by _index_document)
+        self._idx: Dict[str, List[ET.Element]] = {}
+        self._parent_map: Dict[ET.Element, ET.Element] = {}
+
+        # (saved enabled_items list, number of items, disabled positions) for CSV inbound generation
+        self._csv_disabled_indices_cache: Tuple[Optional[list], int, FrozenSet[int]] = (None, 0, frozenset())
+
+        # (parsed_items list, disabled positions, Items for CSV generation) of the last projection
+        self._csv_items_cache: Optional[Tuple[List[Item], FrozenSet[int], List[Item]]] = None
+
+        # (parsed_scenarios, Items for CSV generation) of the last CSV test file regeneration
+        self._last_csv_regeneration: Tuple[Optional[list], Optional[list]] = (None, None)
+
+        # Header/detail TLI items per RSX document (filled by _partition_tli_items)
+        self._tli_partition: Dict[str, tuple] = {}
+
         # Configuration manager (config is now in application folder)
-        config_dir = Path(__file__).parent / ".config"
+        config_dir = APP_DIR / ".config"
         self.config_manager = ConfigManager(config_dir)
 
-        # Database (in application folder)
-        db_path = Path(__file__).parent / "database.db"
-        self.database = Database(db_path)
+        # Database (in application folder), opened on first use
+        self._db_path = APP_DIR / "database.db"
+        self._database: Optional[Database] = None
 
         # Current language
-        self.current_language = self.config_manager.get_language()
+        # Active translation dictionary and the "Not selected" label texts,
+        # updated together with current_language
+        self._set_current_language(self.config_manager.get_language())
 
         # UI elements dictionary for translation
         self.ui_elements = {}
+        # Last applied highlight of the Java Package Name label (None until styled)
+        self._package_label_highlighted: Optional[bool] = None
 
         # Create UI
         self.create_ui()
@@ -152,6 +340,13 @@ class MainWindow(QMainWindow):
         # Update process button state
         self.update_process_button_state()
 
+    @property
+    def database(self) -> Database:
+        """Items database, created on first access"""
+        if self._database is None:
+            self._database = Database(self._db_path)
+        return self._database
+
     def _refresh_all_parsing(self) -> None:
         """Refresh parsing for all three input blocks if files are selected."""
         if self.spreadsheet_path:
@@ -160,6 +355,7 @@ class MainWindow(QMainWindow):
             self._refresh_tnc_parsing()
         if self.csv_archive_path:
             self._refresh_csv_archive_parsing()
+        self.update_process_button_state()
 
     def _create_gear_icon(self) -> QIcon:
         """Create a simple gear-like icon for settings buttons using text"""
@@ -169,7 +365,7 @@ class MainWindow(QMainWindow):
 
     def _create_artifact_checkboxes(self) -> None:
         """Create artifact generation checkboxes with settings buttons"""
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         self.artifact_checkboxes = []
         
         # Define checkboxes with their properties
@@ -376,7 +572,7 @@ class MainWindow(QMainWindow):
         top_layout.addLayout(language_layout)
 
         # Global refresh parsing button in the center
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         self.global_refresh_button = QPushButton(f"↻ {t.get('refresh_parsing', 'Refresh parsing')}")
         self.global_refresh_button.setFixedWidth(180)
         self.global_refresh_button.setFixedHeight(28)
@@ -406,6 +602,7 @@ class MainWindow(QMainWindow):
         
         # Status button (clickable, shows parsing success/failure)
         self.spreadsheet_status_button = QPushButton()
+        self.spreadsheet_status_button.setObjectName("parseStatusButton")
         self.spreadsheet_status_button.setFixedWidth(35)
         self.spreadsheet_status_button.setFixedHeight(28)
         self.spreadsheet_status_button.clicked.connect(self._show_spreadsheet_parse_status)  # type: ignore[arg-type]
@@ -438,6 +635,7 @@ class MainWindow(QMainWindow):
         
         # Status button for TOMMM parsing
         self.tnc_status_button = QPushButton()
+        self.tnc_status_button.setObjectName("parseStatusButton")
         self.tnc_status_button.setFixedWidth(35)
         self.tnc_status_button.setFixedHeight(28)
         self.tnc_status_button.clicked.connect(self._show_tnc_parse_status)  # type: ignore[arg-type]
@@ -469,6 +667,7 @@ class MainWindow(QMainWindow):
         
         # Status button for CSV archive parsing
         self.csv_archive_status_button = QPushButton()
+        self.csv_archive_status_button.setObjectName("parseStatusButton")
         self.csv_archive_status_button.setFixedWidth(35)
         self.csv_archive_status_button.setFixedHeight(28)
         self.csv_archive_status_button.clicked.connect(self._show_csv_archive_parse_status)  # type: ignore[arg-type]
@@ -491,7 +690,7 @@ class MainWindow(QMainWindow):
         layout.addWidget(csv_archive_group)
         
         # Buttons to show parsed data (always visible, styled)
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
 
         buttons_layout = QHBoxLayout()
         buttons_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -545,7 +744,7 @@ class MainWindow(QMainWindow):
         self.ui_elements["company_label"] = company_label
         company_label.setMinimumWidth(labels_min_width)
         self.company_name_field = QLineEdit()
-        self.company_name_field.textChanged.connect(self.update_process_button_state)  # type: ignore[arg-type]
+        self.company_name_field.textChanged.connect(self._update_process_button_enabled)  # type: ignore[arg-type]
         company_layout.addWidget(company_label)
         company_layout.addSpacing(spacing_between_label_and_field)
         company_layout.addWidget(self.company_name_field)
@@ -558,7 +757,7 @@ class MainWindow(QMainWindow):
         package_label.setMinimumWidth(labels_min_width)
         self.java_package_field = QLineEdit()
         # Placeholder will be set in update_ui_texts() based on current language
-        self.java_package_field.textChanged.connect(self.update_process_button_state)  # type: ignore[arg-type]
+        self.java_package_field.textChanged.connect(self._update_process_button_enabled)  # type: ignore[arg-type]
         self.java_package_field.textChanged.connect(self._update_java_package_label_style)  # type: ignore[arg-type]
         package_layout.addWidget(package_label)
         package_layout.addSpacing(spacing_between_label_and_field)
@@ -571,7 +770,7 @@ class MainWindow(QMainWindow):
         self.ui_elements["author_label"] = author_label
         author_label.setMinimumWidth(labels_min_width)
         self.author_field = QLineEdit()
-        self.author_field.textChanged.connect(self.update_process_button_state)  # type: ignore[arg-type]
+        self.author_field.textChanged.connect(self._update_process_button_enabled)  # type: ignore[arg-type]
         self.author_field.editingFinished.connect(self.save_last_author)  # type: ignore[arg-type]
         author_layout.addWidget(author_label)
         author_layout.addSpacing(spacing_between_label_and_field)
@@ -637,6 +836,7 @@ class MainWindow(QMainWindow):
         self.process_button = QPushButton(t["process_data"])
         self.ui_elements["process_button"] = self.process_button
         self.process_button.setEnabled(False)
+        self._process_button_enabled = False
         self.process_button.clicked.connect(self.process_data)  # type: ignore[arg-type]
         buttons_layout.addWidget(self.process_button, stretch=7)
 
@@ -658,11 +858,11 @@ class MainWindow(QMainWindow):
             QGroupBox {
                 font-weight: bold;
             }
-        """)
+        """ + STATUS_BUTTON_STYLE)
 
     def select_spreadsheet(self) -> None:
         """Handle spreadsheet file selection"""
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             t["select_spreadsheet"],
@@ -689,7 +889,7 @@ class MainWindow(QMainWindow):
 
     def select_tnc_platform(self) -> None:
         """Handle T&C Platform file selection"""
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             t["select_tnc"],
@@ -717,7 +917,7 @@ class MainWindow(QMainWindow):
 
     def select_csv_archive(self) -> None:
         """Handle CSV Archive file selection"""
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             t["select_csv_archive"],
@@ -748,7 +948,7 @@ class MainWindow(QMainWindow):
             file_path: Path to .xtl file
             preserve_author: If True, don't overwrite author if it's already set
         """
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         try:
             parsed_data = XTLParser.parse(file_path)
 
@@ -794,7 +994,7 @@ class MainWindow(QMainWindow):
             else:
                 # Even if TNC is not parsed, show buttons with error state
                 self.csv_archive_parse_success = False
-                self.csv_archive_parse_error = TRANSLATIONS[self.current_language].get(
+                self.csv_archive_parse_error = self._t.get(
                     "csv_no_scenarios", 
                     "Please parse TOMMM file first"
                 )
@@ -846,54 +1046,49 @@ class MainWindow(QMainWindow):
 
     def _update_java_package_label_style(self) -> None:
         """Update Java Package Name label style based on field content"""
-        package_label = self.ui_elements["package_label"]
-        has_text = bool(self.java_package_field.text().strip())
-        is_required = self._is_java_package_required()
-
-        # If the field is not required (both XTL checkboxes are off), the label is always normal
-        if not is_required:
-            package_label.setStyleSheet("color: black;")
-            font = package_label.font()
-            font.setBold(False)
-            package_label.setFont(font)
+        # The label is highlighted only when the field is required (any XTL
+        # checkbox is on) and empty
+        highlighted = self._is_java_package_required() and not self.java_package_field.text().strip()
+
+        # Called on every keystroke: restyle only when the highlight changes,
+        # so Qt does not re-parse the stylesheet each time
+        if highlighted == self._package_label_highlighted:
             return
+        self._package_label_highlighted = highlighted
 
-        # If the field is required, highlight it only when it is empty
-        if has_text:
-            package_label.setStyleSheet("color: black;")
-            font = package_label.font()
-            font.setBold(False)
-            package_label.setFont(font)
-        else:
-            package_label.setStyleSheet("color: red;")
-            font = package_label.font()
-            font.setBold(True)
-            package_label.setFont(font)
+        package_label = self.ui_elements["package_label"]
+        package_label.setStyleSheet("color: red;" if highlighted else "color: black;")
+        font = package_label.font()
+        font.setBold(highlighted)
+        package_label.setFont(font)
     
+    def _update_process_button_enabled(self) -> None:
+        """Enable Process Data button when all required inputs are filled.
+
+        Connected directly to the text fields, so it only touches the button
+        when its enabled state actually changes.
+        """
+        enabled = (
+            self.spreadsheet_path is not None
+            and self.tnc_platform_path is not None
+            and self.csv_archive_path is not None
+            and bool(self.company_name_field.text().strip())
+            and bool(self.author_field.text().strip())
+            and (not self._is_java_package_required() or bool(self.java_package_field.text().strip()))
+        )
+        if enabled != self._process_button_enabled:
+            self._process_button_enabled = enabled
+            self.process_button.setEnabled(enabled)
+
     def update_process_button_state(self) -> None:
         """Update Process Data button state and artifact checkboxes"""
-        has_spreadsheet = self.spreadsheet_path is not None
-        has_tnc_platform = self.tnc_platform_path is not None
-        has_csv_archive = self.csv_archive_path is not None
-        has_company_name = bool(self.company_name_field.text().strip())
-        has_java_package = bool(self.java_package_field.text().strip())
-        has_author = bool(self.author_field.text().strip())
-        java_required = self._is_java_package_required()
-        
         all_parsed_successfully = (
             self.spreadsheet_parse_success is True
             and self.tnc_parse_success is True
             and self.csv_archive_parse_success is True
         )
 
-        self.process_button.setEnabled(
-            has_spreadsheet
-            and has_tnc_platform
-            and has_csv_archive
-            and has_company_name
-            and has_author
-            and (not java_required or has_java_package)
-        )
+        self._update_process_button_enabled()
         
         # Initialize TLI sources in artifact_settings if all parsed successfully
         if all_parsed_successfully:
@@ -969,7 +1164,7 @@ class MainWindow(QMainWindow):
 
             os.startfile(str(output_dir))  # type: ignore[attr-defined]
         except Exception as e:
-            t = TRANSLATIONS[self.current_language]
+            t = self._t
             QMessageBox.warning(
                 self,
                 t["warning"],
@@ -978,7 +1173,7 @@ class MainWindow(QMainWindow):
 
     def process_data(self) -> None:
         """Process data and save result to output folder"""
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
 
         # Validate required fields
         if not self.spreadsheet_path:
@@ -1020,6 +1215,9 @@ class MainWindow(QMainWindow):
         if self.artifact_settings.get("gen_csv_inbound", False):
             self._generate_csv_test_files(output_dir)
 
+        # Split TLI items per RSX document once for all RSX test files below
+        self._partition_tli_items()
+
         # Generate unified RSX 855 test file if checkbox is enabled
         if self.artifact_settings.get("gen_rsx_855", False):
             try:
@@ -1418,7 +1616,7 @@ class MainWindow(QMainWindow):
 
         # Load OrderAck.xml template from templates folder
         template_path = self.base_path / "application" / "templates" / "OrderAck.xml"
-        tree = ET.parse(template_path)
+        tree = ET.parse(str(template_path))
         root = tree.getroot()
 
         # Clear all text values from template
@@ -1437,13 +1635,13 @@ class MainWindow(QMainWindow):
 
         # Apply LineSequenceNumber values if enabled
         if gen_line_seq:
-            self._apply_line_sequence_numbers(root, scenario_for_seq)
+            self._apply_line_sequence_numbers(root, scenario_for_seq, "LineItem", "OrderLine")
 
         # Apply PurchaseOrderNumber values (first live, others commented)
         self._apply_purchase_order_numbers(root, scenarios_855)
 
         # Apply TLI Sources values (including Header/Address grouping)
-        self._apply_tli_sources_855(root, max_lines)
+        self._apply_tli_sources(root, "855")
 
         # Always set TradingPartnerId in header for test 855 file
         self._set_xml_value_by_path(
@@ -1455,19 +1653,8 @@ class MainWindow(QMainWindow):
         # Prune empty elements
         self._prune_empty_elements(root)
 
-        # Pretty-print / indent XML (without XML declaration)
-        # Prefer built-in ET.indent when available to keep opening/closing
-        # tags on the same level and use tabs for indentation.
-        if hasattr(ET, "indent"):
-            ET.indent(tree, space="\t", level=0)  # type: ignore[attr-defined]
-        else:
-            self._indent_xml(root)
-
-        rsx_output_dir = output_dir / "RSX test files (outbound docs)"
-        rsx_output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = rsx_output_dir / "855_RSX_test_file.xml"
-
-        tree.write(output_file, encoding="utf-8", xml_declaration=False)
+        # Pretty-print and write XML (without XML declaration)
+        self._write_rsx_test_file(tree, output_dir, "855_RSX_test_file.xml")
 
     def _generate_rsx_856_test_file(self, output_dir: Path) -> None:
         """Generate unified RSX 856 XML test file based on Shipment.xml template.
@@ -1500,7 +1687,7 @@ class MainWindow(QMainWindow):
 
         # Load Shipment.xml template
         template_path = self.base_path / "application" / "templates" / "Shipment.xml"
-        tree = ET.parse(template_path)
+        tree = ET.parse(str(template_path))
         root = tree.getroot()
 
         # Clear all text values from template
@@ -1515,13 +1702,13 @@ class MainWindow(QMainWindow):
 
         # Apply LineSequenceNumber values if enabled
         if gen_line_seq:
-            self._apply_line_sequence_numbers_856(root, scenario_for_seq)
+            self._apply_line_sequence_numbers(root, scenario_for_seq, "ItemLevel", "ShipmentLine")
 
         # Apply PurchaseOrderNumber values (first live, others commented)
         self._apply_purchase_order_numbers(root, scenarios_856)
 
         # Apply TLI Sources values (including Header/Address grouping)
-        self._apply_tli_sources_856(root)
+        self._apply_tli_sources(root, "856")
 
         # Always set TradingPartnerId and ShipmentIdentification in header for test file
         self._set_xml_value_by_path(
@@ -1538,17 +1725,8 @@ class MainWindow(QMainWindow):
         # Prune empty elements
         self._prune_empty_elements(root)
 
-        # Pretty-print / indent XML (without XML declaration)
-        if hasattr(ET, "indent"):
-            ET.indent(tree, space="\t", level=0)  # type: ignore[attr-defined]
-        else:
-            self._indent_xml(root)
-
-        rsx_output_dir = output_dir / "RSX test files (outbound docs)"
-        rsx_output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = rsx_output_dir / "856_RSX_test_file.xml"
-
-        tree.write(output_file, encoding="utf-8", xml_declaration=False)
+        # Pretty-print and write XML (without XML declaration)
+        self._write_rsx_test_file(tree, output_dir, "856_RSX_test_file.xml")
 
     def _generate_rsx_810_test_file(self, output_dir: Path) -> None:
         """Generate unified RSX 810 XML test file based on Invoice.xml template."""
@@ -1574,7 +1752,7 @@ class MainWindow(QMainWindow):
 
         # Load Invoice.xml template from templates folder
         template_path = self.base_path / "application" / "templates" / "Invoice.xml"
-        tree = ET.parse(template_path)
+        tree = ET.parse(str(template_path))
         root = tree.getroot()
 
         # Clear all text values from template
@@ -1585,21 +1763,28 @@ class MainWindow(QMainWindow):
 
         # Apply LineSequenceNumber values if enabled
         if gen_line_seq:
-            self._apply_line_sequence_numbers_810(root, scenario_for_seq)
+            self._apply_line_sequence_numbers(root, scenario_for_seq, "LineItem", "InvoiceLine")
 
         # Apply PurchaseOrderNumber values (first live, others commented)
         self._apply_purchase_order_numbers(root, scenarios_810)
 
+        # Header ChargesAllowances/Taxes and Summary, located in one tree walk
+        first_elements = {}
+        if gen_charges or gen_taxes or gen_total_amount:
+            first_elements = self._build_first_occurrence_index(
+                root, self.FIXED_810_BLOCK_TAGS
+            )
+
         # Apply ChargesAllowances block if enabled
         if gen_charges:
-            self._apply_charges_allowances_810(root)
+            self._apply_charges_allowances_810(first_elements)
 
         # Apply Taxes block if enabled
         if gen_taxes:
-            self._apply_taxes_810(root)
+            self._apply_taxes_810(first_elements)
 
         # Apply TLI Sources values (including Header/Address grouping)
-        self._apply_tli_sources_810(root, max_lines)
+        self._apply_tli_sources(root, "810")
 
         # Always set TradingPartnerId and InvoiceNumber in header for test 810 file
         self._set_xml_value_by_path(
@@ -1615,22 +1800,13 @@ class MainWindow(QMainWindow):
 
         # Apply TotalAmount if enabled
         if gen_total_amount:
-            self._apply_total_amount_810(root)
+            self._apply_total_amount_810(root, first_elements)
 
         # Prune empty elements
         self._prune_empty_elements(root)
 
-        # Pretty-print / indent XML (without XML declaration)
-        if hasattr(ET, "indent"):
-            ET.indent(tree, space="\t", level=0)  # type: ignore[attr-defined]
-        else:
-            self._indent_xml(root)
-
-        rsx_output_dir = output_dir / "RSX test files (outbound docs)"
-        rsx_output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = rsx_output_dir / "810_RSX_test_file.xml"
-
-        tree.write(output_file, encoding="utf-8", xml_declaration=False)
+        # Pretty-print and write XML (without XML declaration)
+        self._write_rsx_test_file(tree, output_dir, "810_RSX_test_file.xml")
 
     def _generate_rsx_856_consolidated_test_file(self, output_dir: Path) -> None:
         """Generate consolidated RSX 856 XML test file based on Shipment.xml template.
@@ -1654,42 +1830,32 @@ class MainWindow(QMainWindow):
         gen_line_seq = rsx_settings.get("gen_line_seq", True)
 
         template_path = self.base_path / "application" / "templates" / "Shipment.xml"
-        tree = ET.parse(template_path)
+        tree = ET.parse(str(template_path))
         root = tree.getroot()
 
         # Clear all text values from template
         self._clear_order_ack_xml_texts(root)
 
         # Find template OrderLevel and its parent (Shipment root)
-        order_parent = None
-        template_order_level = None
-        for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("OrderLevel"):
-                template_order_level = elem
-                break
-
+        template_order_level = root.find(".//{*}OrderLevel")
         if template_order_level is None:
             return
 
         # Determine parent of OrderLevel
-        for parent in root.iter():
-            if template_order_level in list(parent):
-                order_parent = parent
-                break
-
+        order_parent = self._get_parent(root, template_order_level)
         if order_parent is None:
             return
 
         # Remove existing OrderLevel children from parent
         for child in list(order_parent):
-            if isinstance(child.tag, str) and child.tag == template_order_level.tag:
+            if child.tag == template_order_level.tag:
                 order_parent.remove(child)
 
         created_order_levels = []
 
         # Create separate OrderLevel per consolidated scenario
         for scenario in scenarios_consolidated:
-            order_level = copy.deepcopy(template_order_level)
+            order_level = _clone_element(template_order_level)
 
             # For this scenario, clone ItemLevel nodes according to its number_of_lines
             max_lines = scenario.number_of_lines or 1
@@ -1697,7 +1863,7 @@ class MainWindow(QMainWindow):
 
             # Apply LineSequenceNumber per scenario if enabled
             if gen_line_seq:
-                self._apply_line_sequence_numbers_856(order_level, scenario)
+                self._apply_line_sequence_numbers(order_level, scenario, "ItemLevel", "ShipmentLine")
 
             # Set PurchaseOrderNumber for this OrderLevel
             self._set_xml_value_by_path(
@@ -1711,7 +1877,7 @@ class MainWindow(QMainWindow):
 
         # Apply TLI Sources values (including Header/Address grouping) first,
         # щоб усі кількості ShipQty та інші TLI-дані були заповнені.
-        self._apply_tli_sources_856(root)
+        self._apply_tli_sources(root, "856")
 
         # For the first consolidated scenario, split first PackLevel in half
         # на основі вже заповненої кількості ShipQty.
@@ -1737,17 +1903,66 @@ class MainWindow(QMainWindow):
         # Prune empty elements
         self._prune_empty_elements(root)
 
-        # Pretty-print / indent XML (without XML declaration)
-        if hasattr(ET, "indent"):
-            ET.indent(tree, space="\t", level=0)  # type: ignore[attr-defined]
-        else:
-            self._indent_xml(root)
+        # Pretty-print and write XML (without XML declaration)
+        self._write_rsx_test_file(tree, output_dir, "856_RSX_consolidated_test_file.xml")
 
-        rsx_output_dir = output_dir / "RSX test files (outbound docs)"
-        rsx_output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = rsx_output_dir / "856_RSX_consolidated_test_file.xml"
+    def _index_document(self, root: ET.Element) -> None:
+        """Collect structural RSX elements and the parent map in a single tree walk.
 
-        tree.write(output_file, encoding="utf-8", xml_declaration=False)
+        Fills self._idx with LineItem/ItemLevel/OrderLevel/PackLevel lists
+        (in document order) and self._parent_map with child -> parent links.
+        """
+        idx: Dict[str, List[ET.Element]] = {tag: [] for tag in self.INDEXED_RSX_TAGS}
+        parent_map: Dict[ET.Element, ET.Element] = {}
+        for elem in root.iter():
+            for child in elem:
+                parent_map[child] = elem
+            if not isinstance(elem.tag, str):
+                continue
+            bucket = idx.get(_local_name(elem.tag))
+            if bucket is not None:
+                bucket.append(elem)
+        self._idx = idx
+        self._parent_map = parent_map
+
+    def _invalidate_document_index(self) -> None:
+        """Drop the document index after a structural change of the XML tree."""
+        self._idx = {}
+        self._parent_map = {}
+
+    def _find_ancestor(self, elem: ET.Element, tag: str) -> Optional[ET.Element]:
+        """Return the closest ancestor of elem (via the parent map) with the local tag name tag."""
+        parent = self._parent_map.get(elem)
+        while parent is not None:
+            if isinstance(parent.tag, str) and _local_name(parent.tag) == tag:
+                return parent
+            parent = self._parent_map.get(parent)
+        return None
+
+    def _get_parent(self, root: ET.Element, elem: ET.Element) -> Optional[ET.Element]:
+        """Return the parent of elem inside root, rebuilding the cached parent map on a miss."""
+        if hasattr(elem, "getparent"):
+            # lxml elements know their parent
+            return elem.getparent()
+        parent = self._parent_map.get(elem)
+        if parent is None:
+            self._parent_map = {child: p for p in root.iter() for child in p}
+            parent = self._parent_map.get(elem)
+        return parent
+
+    @staticmethod
+    def _child_index(parent: ET.Element, elem: ET.Element) -> int:
+        """Return position of elem among the children of parent, or -1 if it is not a child."""
+        if hasattr(parent, "getparent"):
+            # lxml finds the position in C
+            try:
+                return parent.index(elem)
+            except ValueError:
+                return -1
+        for idx, child in enumerate(parent):
+            if child is elem:
+                return idx
+        return -1
 
     def _clear_order_ack_xml_texts(self, element: ET.Element) -> None:
         """Recursively clear text and tail for all elements in OrderAck template."""
@@ -1759,77 +1974,52 @@ class MainWindow(QMainWindow):
     def _clone_order_ack_line_items(self, root: ET.Element, max_lines: int) -> None:
         """Clone LineItem elements so that their count equals max_lines."""
         # Find first LineItem under OrderAck
-        line_items_parent = None
-        first_line_item = None
-        for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("LineItem"):
-                first_line_item = elem
-                line_items_parent = elem.getparent() if hasattr(elem, "getparent") else None
-                break
-
+        first_line_item = root.find(".//{*}LineItem")
         if first_line_item is None:
             return
 
-        # xml.etree.ElementTree elements do not have getparent by default,
-        # so if parent is not determined, infer it by traversing children
-        if line_items_parent is None:
-            for parent in root.iter():
-                if first_line_item in list(parent):
-                    line_items_parent = parent
-                    break
-
+        # xml.etree.ElementTree elements do not have getparent, so use the parent map
+        line_items_parent = self._get_parent(root, first_line_item)
         if line_items_parent is None:
             return
 
         # Remove all existing LineItem children and recreate from template
-        template_line_item = copy.deepcopy(first_line_item)
+        template_line_item = _clone_element(first_line_item)
         for child in list(line_items_parent):
-            if isinstance(child.tag, str) and child.tag == first_line_item.tag:
+            if child.tag == first_line_item.tag:
                 line_items_parent.remove(child)
 
-        for _ in range(max_lines):
-            line_items_parent.append(copy.deepcopy(template_line_item))
+        # Build all clones first and attach them in one call
+        line_items_parent.extend([_clone_element(template_line_item) for _ in range(max_lines)])
+        self._invalidate_document_index()
 
     def _clone_invoice_line_items(self, root: ET.Element, max_lines: int) -> None:
         """Clone Invoice LineItem elements so that their count equals max_lines."""
-        line_items_parent = None
-        first_line_item = None
-        for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("LineItem"):
-                first_line_item = elem
-                line_items_parent = elem.getparent() if hasattr(elem, "getparent") else None
-                break
-
+        first_line_item = root.find(".//{*}LineItem")
         if first_line_item is None:
             return
 
-        if line_items_parent is None:
-            for parent in root.iter():
-                if first_line_item in list(parent):
-                    line_items_parent = parent
-                    break
-
+        line_items_parent = self._get_parent(root, first_line_item)
         if line_items_parent is None:
             return
 
         # Remember original position of the first LineItem so we can keep
         # Summary (and any other trailing siblings) after all LineItems.
-        children = list(line_items_parent)
-        try:
-            insert_index = children.index(first_line_item)
-        except ValueError:
-            insert_index = len(children)
+        insert_index = self._child_index(line_items_parent, first_line_item)
+        if insert_index < 0:
+            insert_index = len(line_items_parent)
 
-        template_line_item = copy.deepcopy(first_line_item)
+        template_line_item = _clone_element(first_line_item)
         for child in list(line_items_parent):
-            if isinstance(child.tag, str) and child.tag == first_line_item.tag:
+            if child.tag == first_line_item.tag:
                 line_items_parent.remove(child)
 
-        # Insert new LineItem blocks starting at the original index so that
+        # Splice new LineItem blocks in at the original index so that
         # Summary remains after all LineItem elements.
-        for _ in range(max_lines):
-            line_items_parent.insert(insert_index, copy.deepcopy(template_line_item))
-            insert_index += 1
+        line_items_parent[insert_index:insert_index] = [
+            _clone_element(template_line_item) for _ in range(max_lines)
+        ]
+        self._invalidate_document_index()
 
     def _clone_shipment_item_levels(self, root: ET.Element, max_lines: int) -> None:
         """Clone Shipment ItemLevel elements so that their count equals max_lines.
@@ -1837,35 +2027,25 @@ class MainWindow(QMainWindow):
         Operates either on the full Shipment document root or on a subtree such as
         a specific OrderLevel when generating consolidated files.
         """
-        item_parent = None
-        first_item_level = None
-        for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("ItemLevel"):
-                first_item_level = elem
-                break
-
+        first_item_level = root.find(".//{*}ItemLevel")
         if first_item_level is None:
             return
 
         # Determine parent of ItemLevel (expected to be PackLevel)
-        for parent in root.iter():
-            if first_item_level in list(parent):
-                item_parent = parent
-                break
-
+        item_parent = self._get_parent(root, first_item_level)
         if item_parent is None:
             return
 
-        template_item = copy.deepcopy(first_item_level)
+        template_item = _clone_element(first_item_level)
 
         # Remove all existing ItemLevel children under this parent
         for child in list(item_parent):
-            if isinstance(child.tag, str) and child.tag == first_item_level.tag:
+            if child.tag == first_item_level.tag:
                 item_parent.remove(child)
 
-        # Append required number of ItemLevel clones
-        for _ in range(max_lines):
-            item_parent.append(copy.deepcopy(template_item))
+        # Append required number of ItemLevel clones in one call
+        item_parent.extend([_clone_element(template_item) for _ in range(max_lines)])
+        self._invalidate_document_index()
 
     def _split_first_packlevel_in_half(self, order_level: ET.Element) -> None:
         """Split first PackLevel's first ItemLevel into a separate PackLevel with half ShipQty.
@@ -1878,42 +2058,22 @@ class MainWindow(QMainWindow):
           ItemLevel з такою ж половинною ShipQty.
         """
         # Locate first PackLevel within this OrderLevel subtree
-        pack_level = None
-        for elem in order_level.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("PackLevel"):
-                pack_level = elem
-                break
-
+        pack_level = order_level.find(".//{*}PackLevel")
         if pack_level is None:
             return
 
-        # Find parent of PackLevel (expected to be the OrderLevel itself)
-        parent = None
-        for p in order_level.iter():
-            if pack_level in list(p):
-                parent = p
-                break
-
+        # Parent of PackLevel (expected to be the OrderLevel itself) comes from the parent map
+        parent = self._get_parent(order_level, pack_level)
         if parent is None:
             return
 
-        # Find first ItemLevel inside this PackLevel
-        first_item_level = None
-        for child in pack_level:
-            if isinstance(child.tag, str) and child.tag.endswith("ItemLevel"):
-                first_item_level = child
-                break
-
+        # Find first ItemLevel directly inside this PackLevel
+        first_item_level = pack_level.find("{*}ItemLevel")
         if first_item_level is None:
             return
 
-        # Find ShipQty element in the first ItemLevel
-        shipqty_elem = None
-        for el in first_item_level.iter():
-            if isinstance(el.tag, str) and el.tag.endswith("ShipQty"):
-                shipqty_elem = el
-                break
-
+        # Find ShipQty element in the first ItemLevel (it sits under ShipmentLine)
+        shipqty_elem = first_item_level.find(".//{*}ShipQty")
         if shipqty_elem is None or shipqty_elem.text is None:
             return
 
@@ -1922,37 +2082,34 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            val = float(raw)
-        except ValueError:
+            half_val = Decimal(raw) / 2
+        except InvalidOperation:
             return
 
-        half_val = val / 2.0
-        if "." in raw:
-            decimals = len(raw.split(".")[1])
-            fmt = f"{{:.{decimals}f}}"
-            half_str = fmt.format(half_val)
+        # Keep the number of decimal places of the original value
+        dot = raw.rfind(".")
+        if dot >= 0:
+            half_str = _decimal_format(len(raw) - dot - 1).format(half_val)
         else:
-            half_str = str(int(round(half_val)))
+            half_str = str(int(half_val.to_integral_value()))
 
         # Set half value in original first ItemLevel
         shipqty_elem.text = half_str
 
         # Create a copy of the first ItemLevel (already with half ShipQty)
-        new_item_level = copy.deepcopy(first_item_level)
+        new_item_level = _clone_element(first_item_level)
 
         # Create new PackLevel based on original but leave only this one ItemLevel
-        new_pack_level = copy.deepcopy(pack_level)
+        new_pack_level = _clone_element(pack_level)
         for child in list(new_pack_level):
-            if isinstance(child.tag, str) and child.tag.endswith("ItemLevel"):
+            if isinstance(child.tag, str) and _local_name(child.tag) == "ItemLevel":
                 new_pack_level.remove(child)
         new_pack_level.append(new_item_level)
 
         # Insert the new PackLevel immediately after the original one
-        children = list(parent)
-        try:
-            idx = children.index(pack_level)
-        except ValueError:
-            idx = len(children) - 1
+        idx = self._child_index(parent, pack_level)
+        if idx < 0:
+            idx = len(parent) - 1
         parent.insert(idx + 1, new_pack_level)
 
     def _apply_ack_type_drafts(self, root: ET.Element) -> None:
@@ -1962,26 +2119,18 @@ class MainWindow(QMainWindow):
         node directly after the live AcknowledgementType element.
         """
         alt_codes = ["AK", "AC", "RD", "RJ"]
-        for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("AcknowledgementType"):
-                elem.text = "AD"
-                parent = None
-                for p in root.iter():
-                    if isinstance(p.tag, str) and elem in list(p):
-                        parent = p
-                        break
-                if parent is not None:
-                    children = list(parent)
-                    try:
-                        idx = children.index(elem)
-                    except ValueError:
-                        idx = len(children) - 1
-                    insert_index = idx + 1
-                    for code in alt_codes:
-                        comment = ET.Comment(f"<AcknowledgementType>{code}</AcknowledgementType>")
-                        parent.insert(insert_index, comment)
-                        insert_index += 1
-                break
+        elem = root.find(".//{*}AcknowledgementType")
+        if elem is None:
+            return
+
+        elem.text = "AD"
+        parent = self._get_parent(root, elem)
+        if parent is not None:
+            idx = self._child_index(parent, elem)
+            if idx < 0:
+                idx = len(parent) - 1
+            comments = [_draft_comment(f"<AcknowledgementType>{code}</AcknowledgementType>") for code in alt_codes]
+            parent[idx + 1 : idx + 1] = comments
 
     def _apply_item_status_drafts(self, root: ET.Element) -> None:
         """Set ItemStatusCode in each LineItemAcknowledgement to IA and add commented alternatives.
@@ -1990,18 +2139,16 @@ class MainWindow(QMainWindow):
         directly after the live ItemStatusCode element.
         """
         alt_codes = ["IR", "IB", "IP", "IQ", "DR"]
-        for line_ack in root.iter():
-            if isinstance(line_ack.tag, str) and line_ack.tag.endswith("LineItemAcknowledgement"):
-                for idx, child in enumerate(list(line_ack)):
-                    if isinstance(child.tag, str) and child.tag.endswith("ItemStatusCode"):
-                        # Set main (uncommented) status code
-                        child.text = "IA"
-                        insert_index = idx + 1
-                        # Insert a separate commented ItemStatusCode after the main one for each alternative code
-                        for code in alt_codes:
-                            comment = ET.Comment(f"<ItemStatusCode>{code}</ItemStatusCode>")
-                            line_ack.insert(insert_index, comment)
-                            insert_index += 1
+        for line_ack in root.iterfind(".//{*}LineItemAcknowledgement"):
+            # Work from the last ItemStatusCode to the first, so inserted comments
+            # do not shift the positions of the ones not handled yet
+            for status_elem in reversed(list(line_ack.iterfind("{*}ItemStatusCode"))):
+                # Set main (uncommented) status code
+                status_elem.text = "IA"
+                # Insert a separate commented ItemStatusCode after the main one for each alternative code
+                idx = self._child_index(line_ack, status_elem)
+                comments = [_draft_comment(f"<ItemStatusCode>{code}</ItemStatusCode>") for code in alt_codes]
+                line_ack[idx + 1 : idx + 1] = comments
 
     def _apply_tset_purpose_drafts_856(self, root: ET.Element) -> None:
         """Set TsetPurposeCode drafts for Shipment (856).
@@ -2009,122 +2156,60 @@ class MainWindow(QMainWindow):
         Replaces the existing code with 00 and adds a commented alternative 06
         directly after it, preserving indentation.
         """
-        for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("TsetPurposeCode"):
-                elem.text = "00"
-                parent = None
-                for p in root.iter():
-                    if isinstance(p.tag, str) and elem in list(p):
-                        parent = p
-                        break
-                if parent is not None:
-                    children = list(parent)
-                    try:
-                        idx = children.index(elem)
-                    except ValueError:
-                        idx = len(children) - 1
-                    comment = ET.Comment("<TsetPurposeCode>06</TsetPurposeCode>")
-                    parent.insert(idx + 1, comment)
-                break
-
-    def _apply_line_sequence_numbers(self, root: ET.Element, scenario_for_seq: InboundDocScenario) -> None:
-        """Fill LineSequenceNumber in OrderLine items using csv_design of selected scenario.
-
-        This is used for the 855 (OrderAck) document.
-        """
-        if not scenario_for_seq.csv_design:
+        elem = root.find(".//{*}TsetPurposeCode")
+        if elem is None:
             return
 
-        # Extract LineItem_OrderLine rows from CSV design using CSV parser
-        lines: List[str] = []
-        csv_reader = csv.reader(io.StringIO(scenario_for_seq.csv_design))
-        for row in csv_reader:
-            # Expected format: LineItem_OrderLine, <LineSequenceNumber>, ...
-            if len(row) > 0 and row[0] == "LineItem_OrderLine" and len(row) > 1:
-                value = row[1].strip()
-                if value:
-                    lines.append(value)
-
-        # Apply to LineItem/OrderLine/LineSequenceNumber only
-        index = 0
-        for line_item in root.iter():
-            if isinstance(line_item.tag, str) and line_item.tag.endswith("LineItem"):
-                order_line = None
-                for child in line_item:
-                    if isinstance(child.tag, str) and child.tag.endswith("OrderLine"):
-                        order_line = child
-                        break
-                if order_line is None:
-                    continue
-                for child in order_line:
-                    if isinstance(child.tag, str) and child.tag.endswith("LineSequenceNumber"):
-                        if index < len(lines):
-                            child.text = lines[index]
-                        index += 1
-
-    def _apply_line_sequence_numbers_810(self, root: ET.Element, scenario_for_seq: InboundDocScenario) -> None:
-        """Fill LineSequenceNumber in InvoiceLine items using csv_design of selected scenario."""
-        if not scenario_for_seq.csv_design:
-            return
+        elem.text = "00"
+        parent = self._get_parent(root, elem)
+        if parent is not None:
+            idx = self._child_index(parent, elem)
+            if idx < 0:
+                idx = len(parent) - 1
+            comment = _draft_comment("<TsetPurposeCode>06</TsetPurposeCode>")
+            parent.insert(idx + 1, comment)
 
-        # Extract LineItem_OrderLine rows from CSV design using CSV parser
-        lines: List[str] = []
-        csv_reader = csv.reader(io.StringIO(scenario_for_seq.csv_design))
-        for row in csv_reader:
-            # Expected format: LineItem_OrderLine, <LineSequenceNumber>, ...
-            if len(row) > 0 and row[0] == "LineItem_OrderLine" and len(row) > 1:
-                value = row[1].strip()
-                if value:
-                    lines.append(value)
-
-        # Apply to LineItem/InvoiceLine/LineSequenceNumber only
-        index = 0
-        for line_item in root.iter():
-            if isinstance(line_item.tag, str) and line_item.tag.endswith("LineItem"):
-                invoice_line = None
-                for child in line_item:
-                    if isinstance(child.tag, str) and child.tag.endswith("InvoiceLine"):
-                        invoice_line = child
-                        break
-                if invoice_line is None:
-                    continue
-                for child in invoice_line:
-                    if isinstance(child.tag, str) and child.tag.endswith("LineSequenceNumber"):
-                        if index < len(lines):
-                            child.text = lines[index]
-                        index += 1
-
-    def _apply_line_sequence_numbers_856(self, root: ET.Element, scenario_for_seq: InboundDocScenario) -> None:
-        """Fill LineSequenceNumber in ShipmentLine items using csv_design of selected scenario."""
+    def _apply_line_sequence_numbers(
+        self,
+        root: ET.Element,
+        scenario_for_seq: InboundDocScenario,
+        container_tag: str,
+        line_tag: str,
+    ) -> None:
+        """Fill LineSequenceNumber using csv_design of selected scenario.
+
+        Only <container_tag>/<line_tag>/LineSequenceNumber elements are filled:
+        LineItem/OrderLine for 855, LineItem/InvoiceLine for 810 and
+        ItemLevel/ShipmentLine for 856.
+        """
         if not scenario_for_seq.csv_design:
             return
 
-        # Extract LineItem_OrderLine rows from CSV design using CSV parser
-        lines: List[str] = []
-        csv_reader = csv.reader(io.StringIO(scenario_for_seq.csv_design))
-        for row in csv_reader:
+        # CSV rows are read lazily, only as far as there are elements to fill
+        seq_iter = self._iter_sequence_numbers(scenario_for_seq.csv_design)
+
+        # Stream straight to LineSequenceNumber elements and check the two
+        # levels above them through the parent map.
+        for seq_elem in root.iterfind(".//" + _rsx_element_path(("LineSequenceNumber",))):
+            line_elem = self._get_parent(root, seq_elem)
+            if line_elem is None or _local_name(line_elem.tag) != line_tag:
+                continue
+            container_elem = self._get_parent(root, line_elem)
+            if container_elem is None or _local_name(container_elem.tag) != container_tag:
+                continue
+            value = next(seq_iter, None)
+            if value is not None:
+                seq_elem.text = value
+
+    @staticmethod
+    def _iter_sequence_numbers(csv_design: str) -> Iterator[str]:
+        """Yield LineSequenceNumber values from LineItem_OrderLine rows of a CSV design."""
+        for row in csv.reader(io.StringIO(csv_design)):
             # Expected format: LineItem_OrderLine, <LineSequenceNumber>, ...
-            if len(row) > 0 and row[0] == "LineItem_OrderLine" and len(row) > 1:
+            if len(row) > 1 and row[0] == "LineItem_OrderLine":
                 value = row[1].strip()
                 if value:
-                    lines.append(value)
-
-        # Apply to ItemLevel/ShipmentLine/LineSequenceNumber
-        index = 0
-        for item_level in root.iter():
-            if isinstance(item_level.tag, str) and item_level.tag.endswith("ItemLevel"):
-                shipment_line = None
-                for child in item_level:
-                    if isinstance(child.tag, str) and child.tag.endswith("ShipmentLine"):
-                        shipment_line = child
-                        break
-                if shipment_line is None:
-                    continue
-                for child in shipment_line:
-                    if isinstance(child.tag, str) and child.tag.endswith("LineSequenceNumber"):
-                        if index < len(lines):
-                            child.text = lines[index]
-                        index += 1
+                    yield value
 
     def _apply_purchase_order_numbers(self, root: ET.Element, scenarios_855: List[InboundDocScenario]) -> None:
         """Set PurchaseOrderNumber from first 855 scenario and add commented alternatives for others."""
@@ -2134,20 +2219,10 @@ class MainWindow(QMainWindow):
         first_value = scenarios_855[0].key
         other_values = [s.key for s in scenarios_855[1:]]
 
-        po_parent = None
-        po_element = None
-        for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("PurchaseOrderNumber"):
-                po_element = elem
-                # Determine parent
-                for p in root.iter():
-                    if isinstance(p.tag, str) and elem in list(p):
-                        po_parent = p
-                        break
-                break
-
+        po_element = root.find(".//{*}PurchaseOrderNumber")
         if po_element is None:
             return
+        po_parent = self._get_parent(root, po_element)
 
         po_element.text = first_value
 
@@ -2155,350 +2230,280 @@ class MainWindow(QMainWindow):
             return
 
         # Insert commented PurchaseOrderNumber elements directly after the main one
-        children = list(po_parent)
-        try:
-            idx = children.index(po_element)
-        except ValueError:
-            idx = len(children) - 1
-
-        insert_index = idx + 1
-        for value in other_values:
-            comment = ET.Comment(f"<PurchaseOrderNumber>{value}</PurchaseOrderNumber>")
-            po_parent.insert(insert_index, comment)
-            insert_index += 1
-
-    def _apply_tli_sources_855(self, root: ET.Element, max_lines: int) -> None:
-        """Apply TLI Sources values to OrderAck XML, including Header/Address grouping."""
-        rsx_settings = self.artifact_settings.get("rsx_855_settings", {})
-        tli_sources = rsx_settings.get("tli_sources", {})
-        if not tli_sources:
-            return
+        idx = self._child_index(po_parent, po_element)
+        if idx < 0:
+            idx = len(po_parent) - 1
+
+        comments = [_draft_comment(f"<PurchaseOrderNumber>{value}</PurchaseOrderNumber>") for value in other_values]
+        po_parent[idx + 1 : idx + 1] = comments
+
+    def _partition_tli_items(self) -> None:
+        """Split parsed items into header/detail TLI items for every RSX document in one pass.
+
+        Fills self._tli_partition as {doc_code: (header_items, detail_entries)},
+        where detail_entries are (item, sub_parts) tuples with the RSX path
+        relative to the LineItem/ItemLevel container.
+        """
+        partition = {doc_code: ([], []) for doc_code in self.RSX_DOC_TYPES}
+        tli_sources = {
+            doc_code: self.artifact_settings.get(f"rsx_{doc_code}_settings", {}).get("tli_sources", {})
+            for doc_code in self.RSX_DOC_TYPES
+        }
 
-        # Separate header and detail items
-        header_items = []
-        detail_items = []
         for item in self.parsed_items:
             item_id = getattr(item, "item_properties_id", None)
-            rsx_path = getattr(item, "rsx_path_855", "")
-            if not rsx_path or not item_id:
+            if not item_id:
                 continue
-            if not tli_sources.get(str(item_id), False):
-                continue
-            if item.is_on_detail_level:
-                detail_items.append(item)
-            else:
-                header_items.append(item)
+            item_key = str(item_id)
+            for doc_code, (_, path_attr, sub_parts_attr) in self.RSX_DOC_TYPES.items():
+                if not getattr(item, path_attr, ""):
+                    continue
+                if not tli_sources[doc_code].get(item_key, False):
+                    continue
+                header_items, detail_entries = partition[doc_code]
+                if item.is_on_detail_level:
+                    detail_entries.append((item, getattr(item, sub_parts_attr)))
+                else:
+                    header_items.append(item)
 
-        # Apply header items
-        self._apply_header_tli_items(root, header_items)
+        self._tli_partition = partition
 
-        # Apply detail items for each LineItem
-        self._apply_detail_tli_items(root, detail_items, max_lines)
+    def _apply_tli_sources(self, root: ET.Element, doc_code: str) -> None:
+        """Apply TLI Sources values to an RSX document (855/856/810), including Header/Address grouping."""
+        if doc_code not in self._tli_partition:
+            self._partition_tli_items()
+        header_items, detail_entries = self._tli_partition[doc_code]
+        if not header_items and not detail_entries:
+            return
 
-    def _apply_header_tli_items(self, root: ET.Element, header_items: List[Item]) -> None:
-        """Apply header-level TLI items for OrderAck with Extra Record grouping support."""
+        # Index LineItem/ItemLevel/OrderLevel elements once for all passes below
+        self._index_document(root)
 
-        def apply_normal_item(item: Item, path_parts: List[str]) -> None:
+        def apply_normal_item(item: Item, path_parts: Tuple[str, ...]) -> None:
             """Apply a single header item without Extra Record grouping."""
-            self._set_xml_value_by_path(root, path_parts, item.tli_value)
+            # Для 856: якщо шлях містить OrderLevel, значення має бути вставлене
+            # в кожен Shipment/OrderLevel (наприклад, OrderHeader/Vendor
+            # для кожного замовлення в консолідованому 856).
+            if doc_code == "856" and item.rsx_856_order_sub_parts:
+                for order_level in self._idx.get("OrderLevel", []):
+                    self._set_xml_value_by_path(order_level, item.rsx_856_order_sub_parts, item.tli_value)
+            else:
+                # Звичайний випадок: один елемент під Header
+                self._set_xml_value_by_path(root, path_parts, item.tli_value)
 
+        doc_root_name, path_attr, _ = self.RSX_DOC_TYPES[doc_code]
         self._apply_header_items_with_extra_records(
             root=root,
             header_items=header_items,
-            rsx_attr_name="rsx_path_855",
-            doc_root_name="OrderAck",
+            rsx_attr_name=path_attr,
+            doc_root_name=doc_root_name,
             apply_normal_item=apply_normal_item,
         )
 
-    def _apply_detail_tli_items(self, root: ET.Element, detail_items: List[Item], max_lines: int) -> None:
-        """Apply detail-level TLI items for each LineItem, substituting {sequential_number}."""
-        if not detail_items:
+        if doc_code == "856":
+            self._apply_detail_tli_items_856(detail_entries)
+        else:
+            self._apply_detail_tli_items(detail_entries)
+
+    def _apply_detail_tli_items(self, detail_entries: List[tuple]) -> None:
+        """Apply detail-level TLI items for each LineItem (855/810), substituting {sequential_number}."""
+        if not detail_entries:
             return
 
-        # Collect all LineItem elements
-        line_items = [elem for elem in root.iter() if isinstance(elem.tag, str) and elem.tag.endswith("LineItem")]
+        line_items = self._idx.get("LineItem", [])
         if not line_items:
             return
 
+        detail_plan = self._plan_detail_items(detail_entries)
         for index, line_item in enumerate(line_items, start=1):
-            items_for_line = []
-            for item in detail_items:
-                if not item.rsx_path_855:
-                    continue
-                value = item.tli_value.replace("{sequential_number}", str(index))
-                parts = item.rsx_path_855.split("_")
-                # Skip leading parts until we reach LineItem subtree
-                try:
-                    idx = parts.index("LineItem")
-                    sub_parts = parts[idx + 1 :]
-                except ValueError:
-                    sub_parts = parts
-                items_for_line.append((item, sub_parts, value))
-
-            self._apply_detail_items_with_extra_records(line_item, items_for_line)
-
-    def _apply_tli_sources_856(self, root: ET.Element) -> None:
-        """Apply TLI Sources values to Shipment XML, including Header/Address grouping."""
-        rsx_settings = self.artifact_settings.get("rsx_856_settings", {})
-        tli_sources = rsx_settings.get("tli_sources", {})
-        if not tli_sources:
-            return
-
-        header_items: List[Item] = []
-        detail_items: List[Item] = []
-        for item in self.parsed_items:
-            item_id = getattr(item, "item_properties_id", None)
-            rsx_path = getattr(item, "rsx_path_856", "")
-            if not rsx_path or not item_id:
-                continue
-            if not tli_sources.get(str(item_id), False):
-                continue
-            if item.is_on_detail_level:
-                detail_items.append(item)
-            else:
-                header_items.append(item)
-
-        self._apply_header_tli_items_856(root, header_items)
-        self._apply_detail_tli_items_856(root, detail_items)
+            self._apply_detail_items_with_extra_records(line_item, detail_plan, str(index))
 
-    def _apply_header_tli_items_856(self, root: ET.Element, header_items: List[Item]) -> None:
-        """Apply header-level TLI items for Shipment with Extra Record grouping support."""
-
-        def apply_normal_item(item: Item, path_parts: List[str]) -> None:
-            """Apply a single header item without Extra Record grouping."""
-            # Якщо шлях містить OrderLevel, значення має бути вставлене
-            # в кожен Shipment/OrderLevel (наприклад, OrderHeader/Vendor
-            # для кожного замовлення в консолідованому 856).
-            if "OrderLevel" in path_parts:
-                try:
-                    idx = path_parts.index("OrderLevel")
-                    sub_parts = path_parts[idx + 1 :]
-                except ValueError:
-                    sub_parts = path_parts
-
-                order_levels = [
-                    elem
-                    for elem in root.iter()
-                    if isinstance(elem.tag, str) and elem.tag.endswith("OrderLevel")
-                ]
-                for order_level in order_levels:
-                    self._set_xml_value_by_path(order_level, sub_parts, item.tli_value)
-            else:
-                # Звичайний випадок: один елемент під Header/Shipment
-                self._set_xml_value_by_path(root, path_parts, item.tli_value)
-
-        self._apply_header_items_with_extra_records(
-            root=root,
-            header_items=header_items,
-            rsx_attr_name="rsx_path_856",
-            doc_root_name="Shipment",
-            apply_normal_item=apply_normal_item,
-        )
-
-    def _apply_detail_tli_items_856(self, root: ET.Element, detail_items: List[Item]) -> None:
+    def _apply_detail_tli_items_856(self, detail_entries: List[tuple]) -> None:
         """Apply detail-level TLI items for each Shipment ItemLevel, substituting {sequential_number}."""
-        if not detail_items:
+        if not detail_entries:
             return
 
+        detail_plan = self._plan_detail_items(detail_entries)
+
         # Для консолідованого 856 нумерація повинна починатися з 1
         # всередині кожного OrderLevel окремо. Тому обробляємо ItemLevel
         # по групах OrderLevel, а не одним суцільним списком.
 
-        order_levels = [
-            elem for elem in root.iter() if isinstance(elem.tag, str) and elem.tag.endswith("OrderLevel")
-        ]
+        order_levels = self._idx.get("OrderLevel", [])
 
         if order_levels:
+            # Групуємо ItemLevel за найближчим OrderLevel через parent map
+            item_levels_by_order: Dict[ET.Element, List[ET.Element]] = {}
+            for item_level in self._idx.get("ItemLevel", []):
+                owner = self._find_ancestor(item_level, "OrderLevel")
+                if owner is not None:
+                    item_levels_by_order.setdefault(owner, []).append(item_level)
+
             # Основний шлях: є явні OrderLevel, нумерація скидається для кожного
             for order_level in order_levels:
-                item_levels = [
-                    elem
-                    for elem in order_level.iter()
-                    if isinstance(elem.tag, str) and elem.tag.endswith("ItemLevel")
-                ]
+                item_levels = item_levels_by_order.get(order_level)
                 if not item_levels:
                     continue
                 for index, item_level in enumerate(item_levels, start=1):
-                    items_for_level = []
-                    for item in detail_items:
-                        rsx_path = getattr(item, "rsx_path_856", "")
-                        if not rsx_path:
-                            continue
-                        value = item.tli_value.replace("{sequential_number}", str(index))
-                        parts = rsx_path.split("_")
-                        try:
-                            idx = parts.index("ItemLevel")
-                            sub_parts = parts[idx + 1 :]
-                        except ValueError:
-                            sub_parts = parts
-                        items_for_level.append((item, sub_parts, value))
-
-                    self._apply_detail_items_with_extra_records(item_level, items_for_level)
+                    self._apply_detail_items_with_extra_records(item_level, detail_plan, str(index))
         else:
             # Fallback: старий режим, якщо з якихось причин немає тегів OrderLevel
-            item_levels = [
-                elem for elem in root.iter() if isinstance(elem.tag, str) and elem.tag.endswith("ItemLevel")
-            ]
+            item_levels = self._idx.get("ItemLevel", [])
             if not item_levels:
                 return
 
             for index, item_level in enumerate(item_levels, start=1):
-                items_for_level = []
-                for item in detail_items:
-                    rsx_path = getattr(item, "rsx_path_856", "")
-                    if not rsx_path:
-                        continue
-                    value = item.tli_value.replace("{sequential_number}", str(index))
-                    parts = rsx_path.split("_")
-                    try:
-                        idx = parts.index("ItemLevel")
-                        sub_parts = parts[idx + 1 :]
-                    except ValueError:
-                        sub_parts = parts
-                    items_for_level.append((item, sub_parts, value))
-
-                self._apply_detail_items_with_extra_records(item_level, items_for_level)
-
-    def _apply_tli_sources_810(self, root: ET.Element, max_lines: int) -> None:
-        """Apply TLI Sources values to Invoice XML, including Header/Address grouping."""
-        rsx_settings = self.artifact_settings.get("rsx_810_settings", {})
-        tli_sources = rsx_settings.get("tli_sources", {})
-        if not tli_sources:
-            return
-
-        header_items: List[Item] = []
-        detail_items: List[Item] = []
-        for item in self.parsed_items:
-            item_id = getattr(item, "item_properties_id", None)
-            rsx_path = getattr(item, "rsx_path_810", "")
-            if not rsx_path or not item_id:
-                continue
-            if not tli_sources.get(str(item_id), False):
-                continue
-            if item.is_on_detail_level:
-                detail_items.append(item)
-            else:
-                header_items.append(item)
-
-        self._apply_header_tli_items_810(root, header_items)
-        self._apply_detail_tli_items_810(root, detail_items, max_lines)
-
-    def _apply_header_tli_items_810(self, root: ET.Element, header_items: List[Item]) -> None:
-        """Apply header-level TLI items for Invoice with Extra Record grouping support."""
+                self._apply_detail_items_with_extra_records(item_level, detail_plan, str(index))
 
-        def apply_normal_item(item: Item, path_parts: List[str]) -> None:
-            """Apply a single header item without Extra Record grouping."""
-            self._set_xml_value_by_path(root, path_parts, item.tli_value)
+    def _plan_detail_items(self, detail_entries: List[tuple]) -> tuple:
+        """Split detail entries into Extra Record groups and normal items once per document.
 
-        self._apply_header_items_with_extra_records(
-            root=root,
-            header_items=header_items,
-            rsx_attr_name="rsx_path_810",
-            doc_root_name="Invoice",
-            apply_normal_item=apply_normal_item,
-        )
-
-    def _apply_detail_items_with_extra_records(
-        self,
-        container: ET.Element,
-        items_for_container: List[tuple],
-    ) -> None:
-        """Apply detail-level items inside a single LineItem/ItemLevel with Extra Record grouping.
-
-        items_for_container is a list of tuples (item, sub_parts, value), where
-        sub_parts is the RSX path relative to the container element (for
-        example ["ProductOrItemDescription", "ProductDescription"]). Items
+        detail_entries is a list of tuples (item, sub_parts), where sub_parts
+        is the RSX path relative to the LineItem/ItemLevel container (for
+        example ("ProductOrItemDescription", "ProductDescription")). Items
         that have extra_record_defining_rsx_tag and extra_record_defining_qual
-        set will be grouped so that for each unique combination of:
+        set are grouped by the unique combination of:
 
         - parent path (up to the repeating container element),
         - extra_record_defining_rsx_tag (qualifier element name),
-        - extra_record_defining_qual (qualifier value),
+        - extra_record_defining_qual (qualifier value).
 
-        all values are written into the same repeated element instance inside
-        this LineItem/ItemLevel.
+        Returns a tuple (grouped_plan, normal_plan). grouped_plan is a list of
+        (container_parent_parts, repeated_tag, extra_tag, extra_qual,
+        [(item, inner_parts), ...]) with inner_parts relative to the repeated
+        element; normal_plan is a list of (item, sub_parts). The classification
+        depends only on the items, so it is reused for every LineItem/ItemLevel.
         """
-        if not items_for_container:
-            return
-
-        grouped = {}
-        normal_items = []
+        grouped: Dict[tuple, list] = {}
+        normal_plan = []
 
-        for item, sub_parts, value in items_for_container:
+        for item, sub_parts in detail_entries:
             if not sub_parts:
-                normal_items.append((item, sub_parts, value))
                 continue
 
-            extra_tag = (getattr(item, "extra_record_defining_rsx_tag", "") or "").strip()
-            extra_qual = (getattr(item, "extra_record_defining_qual", "") or "").strip()
+            extra_tag = (item.extra_record_defining_rsx_tag or "").strip()
+            extra_qual = (item.extra_record_defining_qual or "").strip()
 
             if extra_tag and extra_qual and len(sub_parts) >= 2:
-                parent_parts = sub_parts[:-1]
-                key = (tuple(parent_parts), extra_tag, extra_qual)
-                grouped.setdefault(key, []).append((item, sub_parts, value))
+                key = (tuple(sub_parts[:-1]), extra_tag, extra_qual)
+                grouped.setdefault(key, []).append((item, sub_parts))
             else:
-                normal_items.append((item, sub_parts, value))
-
-        # Handle grouped items with Extra Record semantics
-        for (parent_parts_tuple, extra_tag, extra_qual), items_for_group in grouped.items():
-            parent_parts = list(parent_parts_tuple)
-            if not parent_parts:
-                continue
+                normal_plan.append((item, sub_parts))
 
+        grouped_plan = []
+        for (parent_parts, extra_tag, extra_qual), items_for_group in grouped.items():
             repeated_tag = parent_parts[-1]
-            container_parent_parts = parent_parts[:-1]
+            group_items = []
+            for item, full_sub_parts in items_for_group:
+                inner_parts = _rsx_parts_after(tuple(full_sub_parts), repeated_tag)
 
-            parent_elem = self._find_element_by_path(container, container_parent_parts)
-            if parent_elem is None:
-                continue
+                if not inner_parts:
+                    continue
 
-            existing = [
-                child
-                for child in list(parent_elem)
-                if isinstance(child.tag, str) and child.tag.endswith(repeated_tag)
-            ]
+                # The defining element itself gets extra_record_defining_qual, not a TLI value
+                if len(inner_parts) == 1 and inner_parts[0] == extra_tag:
+                    continue
 
-            # Try to find an existing repeated element with matching qualifier value
-            container_elem = None
-            for candidate in existing:
-                qual_elem = self._find_element_by_path(candidate, [extra_tag])
-                if qual_elem is not None and (qual_elem.text or "").strip() == extra_qual:
-                    container_elem = candidate
-                    break
+                group_items.append((item, inner_parts))
+            grouped_plan.append((parent_parts[:-1], repeated_tag, extra_tag, extra_qual, group_items))
 
-            # If not found, create a new repeated element
-            if container_elem is None:
-                if existing:
-                    template_elem = existing[0]
-                else:
-                    template_elem = ET.Element(repeated_tag)
-                container_elem = copy.deepcopy(template_elem)
-                parent_elem.append(container_elem)
+        return grouped_plan, normal_plan
 
-            # Set defining qualifier element
-            self._set_xml_value_by_path(container_elem, [extra_tag], extra_qual)
+    @staticmethod
+    def _line_tli_value(item: Item, seq: str) -> str:
+        """Return TLI value of item with {sequential_number} replaced by seq."""
+        if item.has_sequential_number:
+            return seq.join(item.tli_value_segments)
+        return item.tli_value
 
-            # Apply all values from this group inside the same repeated element
-            for grouped_item, full_sub_parts, grouped_value in items_for_group:
-                try:
-                    idx = full_sub_parts.index(repeated_tag)
-                    inner_parts = full_sub_parts[idx + 1 :]
-                except ValueError:
-                    inner_parts = full_sub_parts
+    def _apply_detail_items_with_extra_records(
+        self,
+        container: ET.Element,
+        detail_plan: tuple,
+        seq: str,
+    ) -> None:
+        """Apply detail-level items inside a single LineItem/ItemLevel with Extra Record grouping.
 
-                if not inner_parts:
-                    continue
+        detail_plan comes from _plan_detail_items and seq is the sequential
+        number of this LineItem/ItemLevel. All values of one Extra Record
+        group are written into the same repeated element instance inside
+        this LineItem/ItemLevel.
+        """
+        grouped_plan, normal_plan = detail_plan
 
-                if len(inner_parts) == 1 and inner_parts[0] == extra_tag:
-                    continue
+        # Repeated elements per (parent, repeated tag, qualifier tag), keyed by qualifier value
+        repeats_index: Dict[tuple, tuple] = {}
 
-                self._set_xml_value_by_path(container_elem, inner_parts, grouped_value)
+        # Handle grouped items with Extra Record semantics
+        for container_parent_parts, repeated_tag, extra_tag, extra_qual, group_items in grouped_plan:
+            parent_elem = self._find_element_by_path(container, container_parent_parts)
+            if parent_elem is None:
+                continue
+
+            # Find the repeated element with matching qualifier value or create
+            # a new one; the defining qualifier element is set in both cases.
+            container_elem = self._get_extra_record_container(
+                parent_elem, repeated_tag, extra_tag, extra_qual, repeats_index
+            )
+
+            # Apply all values from this group inside the same repeated element
+            for item, inner_parts in group_items:
+                self._set_xml_value_by_path(container_elem, inner_parts, self._line_tli_value(item, seq))
 
         # Apply non-grouped items normally
-        for item, sub_parts, value in normal_items:
-            if not sub_parts:
-                continue
-            self._set_xml_value_by_path(container, sub_parts, value)
+        for item, sub_parts in normal_plan:
+            self._set_xml_value_by_path(container, sub_parts, self._line_tli_value(item, seq))
+
+    def _get_extra_record_container(
+        self,
+        parent_elem: ET.Element,
+        repeated_tag: str,
+        extra_tag: str,
+        extra_qual: str,
+        repeats_index: Dict[tuple, tuple],
+    ) -> ET.Element:
+        """Return the repeated element of an Extra Record group, creating it when missing.
+
+        repeats_index caches, per (parent element, repeated tag, qualifier
+        tag), the existing repeats keyed by qualifier value together with the
+        template repeat, so the children of parent_elem are scanned once
+        instead of once per group. When no repeat has the required qualifier
+        value, the first existing repeat (or a bare element if there is none)
+        is cloned and appended. The defining qualifier element is set to
+        extra_qual on the returned element.
+        """
+        index_key = (parent_elem, repeated_tag, extra_tag)
+        entry = repeats_index.get(index_key)
+        if entry is None:
+            by_qual: Dict[str, ET.Element] = {}
+            template_elem = None
+            for child in _children_with_local_name(parent_elem, repeated_tag):
+                if template_elem is None:
+                    template_elem = child
+                qual_elem = self._find_element_by_path(child, [extra_tag])
+                if qual_elem is not None:
+                    by_qual.setdefault((qual_elem.text or "").strip(), child)
+            entry = (by_qual, template_elem)
+            repeats_index[index_key] = entry
+
+        by_qual, template_elem = entry
+        container_elem = by_qual.get(extra_qual)
+        if container_elem is not None:
+            return container_elem
+
+        if template_elem is None:
+            # Fallback: create a bare element if the template is missing.
+            # In this rare case nested paths may not be populated, but we
+            # avoid crashing.
+            template_elem = ET.Element(repeated_tag)
+        container_elem = _clone_element(template_elem)
+        parent_elem.append(container_elem)
+
+        qual_elem = self._find_element_by_path(container_elem, [extra_tag])
+        if qual_elem is not None:
+            qual_elem.text = extra_qual
+            by_qual[extra_qual] = container_elem
+        return container_elem
 
     def _apply_header_items_with_extra_records(
         self,
@@ -2524,6 +2529,19 @@ class MainWindow(QMainWindow):
         if not header_items:
             return
 
+        # Fast path: most documents have no Extra Record header items, so
+        # every item is applied directly without building the groups.
+        if not any(
+            (getattr(item, "extra_record_defining_rsx_tag", "") or "").strip()
+            and (getattr(item, "extra_record_defining_qual", "") or "").strip()
+            for item in header_items
+        ):
+            for item in header_items:
+                rsx_path = getattr(item, rsx_attr_name, "") or ""
+                if rsx_path:
+                    apply_normal_item(item, _split_rsx(rsx_path, doc_root_name))
+            return
+
         # Split items into Extra Record groups and regular header items
         grouped = {}
         normal_items = []
@@ -2533,9 +2551,7 @@ class MainWindow(QMainWindow):
             if not rsx_path:
                 continue
 
-            path_parts = rsx_path.split("_")
-            if path_parts and path_parts[0] == doc_root_name:
-                path_parts = path_parts[1:]
+            path_parts = _split_rsx(rsx_path, doc_root_name)
 
             extra_tag = (getattr(item, "extra_record_defining_rsx_tag", "") or "").strip()
             extra_qual = (getattr(item, "extra_record_defining_qual", "") or "").strip()
@@ -2544,16 +2560,21 @@ class MainWindow(QMainWindow):
             # two path parts (so there is a parent container) participate
             # in grouping. Others are treated as regular header items.
             if extra_tag and extra_qual and len(path_parts) >= 2:
-                parent_parts = path_parts[:-1]
-                key = (tuple(parent_parts), extra_tag, extra_qual)
-                grouped.setdefault(key, []).append((item, path_parts))
+                # Parent parts tuple is shared by all items with the same RSX path
+                key = (_split_rsx_parent(rsx_path, doc_root_name), extra_tag, extra_qual)
+                group = grouped.get(key)
+                if group is None:
+                    group = grouped[key] = []
+                group.append((item, path_parts))
             else:
                 normal_items.append((item, path_parts))
 
+        # Repeated elements per (parent, repeated tag, qualifier tag), keyed by qualifier value
+        repeats_index: Dict[tuple, tuple] = {}
+
         # For each Extra Record group create or reuse a repeated container
         # element under its parent and write all values into that container.
-        for (parent_parts_tuple, extra_tag, extra_qual), items_for_group in grouped.items():
-            parent_parts = list(parent_parts_tuple)
+        for (parent_parts, extra_tag, extra_qual), items_for_group in grouped.items():
             if not parent_parts:
                 continue
 
@@ -2564,46 +2585,17 @@ class MainWindow(QMainWindow):
             if parent_elem is None:
                 continue
 
-            existing = [
-                child
-                for child in list(parent_elem)
-                if isinstance(child.tag, str) and child.tag.endswith(repeated_tag)
-            ]
-
-            # First, try to find an existing repeated element where the
-            # defining qualifier element already has the required value.
-            container_elem = None
-            for candidate in existing:
-                qual_elem = self._find_element_by_path(candidate, [extra_tag])
-                if qual_elem is not None and (qual_elem.text or "").strip() == extra_qual:
-                    container_elem = candidate
-                    break
-
-            # If not found, create a new repeated element (clone template
-            # if available, otherwise create a bare element) and append it.
-            if container_elem is None:
-                if existing:
-                    template_elem = existing[0]
-                else:
-                    # Fallback: create a bare element if the template is
-                    # missing. In this rare case nested paths may not be
-                    # populated, but we avoid crashing.
-                    template_elem = ET.Element(repeated_tag)
-                container_elem = copy.deepcopy(template_elem)
-                parent_elem.append(container_elem)
-
-            # First, set the qualifier element that defines this Extra
-            # Record group (for example AddressTypeCode = ST / VN).
-            self._set_xml_value_by_path(container_elem, [extra_tag], extra_qual)
+            # Reuse the repeated element where the defining qualifier element
+            # already has the required value, or create a new one. Either way
+            # the qualifier (for example AddressTypeCode = ST / VN) is set.
+            container_elem = self._get_extra_record_container(
+                parent_elem, repeated_tag, extra_tag, extra_qual, repeats_index
+            )
 
             # Then, apply all TLI values that belong to this group into
             # the same repeated container.
             for grouped_item, full_path_parts in items_for_group:
-                try:
-                    idx = full_path_parts.index(repeated_tag)
-                    sub_parts = full_path_parts[idx + 1 :]
-                except ValueError:
-                    sub_parts = full_path_parts
+                sub_parts = _rsx_parts_after(full_path_parts, repeated_tag)
 
                 # Nothing to set inside this container
                 if not sub_parts:
@@ -2621,81 +2613,63 @@ class MainWindow(QMainWindow):
         for normal_item, normal_path_parts in normal_items:
             apply_normal_item(normal_item, normal_path_parts)
 
-    def _apply_detail_tli_items_810(self, root: ET.Element, detail_items: List[Item], max_lines: int) -> None:
-        """Apply detail-level TLI items for each Invoice LineItem, substituting {sequential_number}."""
-        if not detail_items:
-            return
-
-        line_items = [elem for elem in root.iter() if isinstance(elem.tag, str) and elem.tag.endswith("LineItem")]
-        if not line_items:
-            return
-
-        for index, line_item in enumerate(line_items, start=1):
-            items_for_line = []
-            for item in detail_items:
-                rsx_path = getattr(item, "rsx_path_810", "")
-                if not rsx_path:
-                    continue
-                value = item.tli_value.replace("{sequential_number}", str(index))
-                parts = rsx_path.split("_")
-                try:
-                    idx = parts.index("LineItem")
-                    sub_parts = parts[idx + 1 :]
-                except ValueError:
-                    sub_parts = parts
-                items_for_line.append((item, sub_parts, value))
-
-            self._apply_detail_items_with_extra_records(line_item, items_for_line)
-
-    def _find_element_by_path(self, root: ET.Element, path_parts: List[str]) -> Optional[ET.Element]:
+    def _find_element_by_path(self, root: ET.Element, path_parts: Sequence[str]) -> Optional[ET.Element]:
         """Navigate XML by tag parts and return the last element, if found."""
         if not path_parts:
             return root
+        return root.find(_rsx_element_path(tuple(path_parts)))
 
-        current = root
-        for part in path_parts:
-            found = None
-            for child in current:
-                if isinstance(child.tag, str) and child.tag.endswith(part):
-                    found = child
-                    break
-            if found is None:
-                return None
-            current = found
-        return current
-
-    def _set_xml_value_by_path(self, root: ET.Element, path_parts: List[str], value: str) -> None:
+    def _set_xml_value_by_path(self, root: ET.Element, path_parts: Sequence[str], value: str) -> None:
         """Navigate XML by tag parts and set text value on last element."""
         if not path_parts:
             return
 
-        current = root
-        for part in path_parts:
-            found = None
-            for child in current:
-                if isinstance(child.tag, str) and child.tag.endswith(part):
-                    found = child
-                    break
-            if found is None:
-                return
-            current = found
-        current.text = value
+        found = self._find_element_by_path(root, path_parts)
+        if found is not None:
+            found.text = value
 
     def _prune_empty_elements(self, element: ET.Element) -> bool:
-        """Recursively remove elements that have no text and no children.
+        """Remove (bottom-up) elements that have no text and no children.
 
-        Returns True if the element itself is empty and should be pruned by caller.
+        The tree is walked in post-order with an explicit stack, so children
+        are pruned before their parent is checked. Returns True if the element
+        itself is empty and should be pruned by caller.
         """
-        # Work on a copy of children list because we may remove elements
-        for child in list(element):
-            if isinstance(child.tag, str):  # Skip comments
-                empty = self._prune_empty_elements(child)
-                if empty:
-                    element.remove(child)
+        is_empty = False
+        # (element, parent, children already visited)
+        stack = [(element, None, False)]
+        while stack:
+            elem, parent, visited = stack.pop()
+            if not visited:
+                stack.append((elem, parent, True))
+                # Reversed so children are visited in document order; comments are skipped
+                stack.extend((child, elem, False) for child in reversed(elem) if isinstance(child.tag, str))
+                continue
 
-        is_empty = (element.text is None or not str(element.text).strip()) and len(element) == 0
+            is_empty = (elem.text is None or not str(elem.text).strip()) and len(elem) == 0
+            if is_empty and parent is not None:
+                parent.remove(elem)
         return is_empty
 
+    def _write_rsx_test_file(self, tree: ET.ElementTree, output_dir: Path, filename: str) -> None:
+        """Indent an RSX tree with tabs and write it straight to the RSX output folder.
+
+        ET.indent (stdlib 3.9+ and lxml 4.5+) keeps opening/closing tags on
+        the same level and works in place on the tree; _indent_xml is only a
+        fallback for older versions. tree.write streams the serialized
+        document into the file without building the whole string first.
+        """
+        if hasattr(ET, "indent"):
+            ET.indent(tree, space="\t", level=0)  # type: ignore[attr-defined]
+        else:
+            self._indent_xml(tree.getroot())
+
+        rsx_output_dir = output_dir / "RSX test files (outbound docs)"
+        rsx_output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = rsx_output_dir / filename
+
+        tree.write(str(output_file), encoding="utf-8", xml_declaration=False)
+
     def _indent_xml(self, elem: ET.Element, level: int = 0) -> None:
         """Fallback pretty-printer for XML when ET.indent is unavailable.
 
@@ -2714,14 +2688,25 @@ class MainWindow(QMainWindow):
             if level and (not elem.tail or not elem.tail.strip()):
                 elem.tail = i
 
-    def _apply_charges_allowances_810(self, root: ET.Element) -> None:
-        """Populate Invoice/Header ChargesAllowances with fixed test values when enabled."""
-        charges_elem = None
+    @staticmethod
+    def _build_first_occurrence_index(root: ET.Element, names: Sequence[str]) -> Dict[str, ET.Element]:
+        """Return {local tag name: first element in document order} for the given names in one tree walk."""
+        wanted = set(names)
+        found: Dict[str, ET.Element] = {}
         for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("ChargesAllowances"):
-                # First ChargesAllowances under Header is the header-level block
-                charges_elem = elem
-                break
+            if not isinstance(elem.tag, str):
+                continue
+            name = _local_name(elem.tag)
+            if name in wanted and name not in found:
+                found[name] = elem
+                if len(found) == len(wanted):
+                    break
+        return found
+
+    def _apply_charges_allowances_810(self, first_elements: Dict[str, ET.Element]) -> None:
+        """Populate Invoice/Header ChargesAllowances with fixed test values when enabled."""
+        # First ChargesAllowances in the document is the header-level block
+        charges_elem = first_elements.get("ChargesAllowances")
         if charges_elem is None:
             return
 
@@ -2732,22 +2717,11 @@ class MainWindow(QMainWindow):
             "AllowChrgHandlingDescription": "SAC15 Description",
         }
 
-        for child in list(charges_elem):
-            if not isinstance(child.tag, str):
-                continue
-            name = child.tag.split("}")[-1]
-            if name in values:
-                child.text = values[name]
-            else:
-                child.text = None
+        self._fill_block_values(charges_elem, values)
 
-    def _apply_taxes_810(self, root: ET.Element) -> None:
+    def _apply_taxes_810(self, first_elements: Dict[str, ET.Element]) -> None:
         """Populate Invoice/Header Taxes with fixed test values when enabled."""
-        taxes_elem = None
-        for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("Taxes"):
-                taxes_elem = elem
-                break
+        taxes_elem = first_elements.get("Taxes")
         if taxes_elem is None:
             return
 
@@ -2756,70 +2730,56 @@ class MainWindow(QMainWindow):
             "TaxAmount": "100",
         }
 
-        for child in list(taxes_elem):
-            if not isinstance(child.tag, str):
-                continue
-            name = child.tag.split("}")[-1]
-            if name in values:
-                child.text = values[name]
-            else:
-                child.text = None
+        self._fill_block_values(taxes_elem, values)
+
+    @staticmethod
+    def _fill_block_values(block: ET.Element, values: Dict[str, str]) -> None:
+        """Set text of the direct children of block from values by local tag name; clear the others."""
+        # Children are only updated, never removed, so no copy of the child list is needed
+        for child in block:
+            if isinstance(child.tag, str):
+                child.text = values.get(_local_name(child.tag))
 
-    def _apply_total_amount_810(self, root: ET.Element) -> None:
+    def _apply_total_amount_810(self, root: ET.Element, first_elements: Dict[str, ET.Element]) -> None:
         """Calculate Summary/TotalAmount as sum(InvoiceQty * PurchasePrice) across LineItems."""
-        total = 0.0
+        # Summary comes from the first-occurrence index built before TLI Sources were applied
+        summary_elem = first_elements.get("Summary")
+        if summary_elem is None:
+            return
+        total_amount_elem = summary_elem.find("{*}TotalAmount")
+        if total_amount_elem is None:
+            return
 
-        # Iterate through all LineItem/InvoiceLine blocks
-        for line_item in root.iter():
-            if not (isinstance(line_item.tag, str) and line_item.tag.endswith("LineItem")):
-                continue
+        total = 0.0
 
-            invoice_line = None
-            for child in line_item:
-                if isinstance(child.tag, str) and child.tag.endswith("InvoiceLine"):
-                    invoice_line = child
-                    break
+        # Only the first InvoiceLine of each LineItem is counted
+        for line_item in root.iterfind(".//{*}LineItem"):
+            invoice_line = line_item.find("{*}InvoiceLine")
             if invoice_line is None:
                 continue
 
-            qty_val = None
-            price_val = None
+            # The last InvoiceQty/PurchasePrice child wins if one is repeated
+            qty_val = price_val = None
             for child in invoice_line:
                 if not isinstance(child.tag, str):
                     continue
-                if child.tag.endswith("InvoiceQty"):
+                name = _local_name(child.tag)
+                if name == "InvoiceQty":
                     qty_val = child.text
-                elif child.tag.endswith("PurchasePrice"):
+                elif name == "PurchasePrice":
                     price_val = child.text
 
             try:
-                qty = float(qty_val) if qty_val is not None and qty_val.strip() else 0.0
+                qty = float(qty_val) if qty_val and qty_val.strip() else 0.0
             except ValueError:
                 qty = 0.0
             try:
-                price = float(price_val) if price_val is not None and price_val.strip() else 0.0
+                price = float(price_val) if price_val and price_val.strip() else 0.0
             except ValueError:
                 price = 0.0
 
             total += qty * price
 
-        # Set Summary/TotalAmount
-        summary_elem = None
-        total_amount_elem = None
-        for elem in root.iter():
-            if isinstance(elem.tag, str) and elem.tag.endswith("Summary"):
-                summary_elem = elem
-                break
-        if summary_elem is None:
-            return
-
-        for child in summary_elem:
-            if isinstance(child.tag, str) and child.tag.endswith("TotalAmount"):
-                total_amount_elem = child
-                break
-        if total_amount_elem is None:
-            return
-
         # Adjust total with Taxes and ChargesAllowances if corresponding options are enabled
         rsx_settings = self.artifact_settings.get("rsx_810_settings", {})
         if rsx_settings.get("gen_taxes", True):
@@ -2831,24 +2791,34 @@ class MainWindow(QMainWindow):
 
     def _generate_csv_test_files(self, output_dir: Path) -> None:
         """Generate CSV test files for inbound documents"""
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         
         try:
             # Create subdirectory for CSV files
             csv_output_dir = output_dir / "CSV test files (inbound docs)"
             csv_output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Generate file for each scenario with CSV test file
-            for scenario in self.parsed_scenarios:
-                if scenario.csv_test_file and scenario.csv_design_filename:
-                    # Use original csv_design_filename without adding "_test" suffix
-                    output_filename = scenario.csv_design_filename
-                    output_filepath = csv_output_dir / output_filename
-                    
-                    # Write CSV test file
-                    output_filepath.write_text(scenario.csv_test_file, encoding="utf-8")
+            # Collect file for each scenario with CSV test file
+            # (original csv_design_filename, without adding "_test" suffix)
+            tasks = [
+                (csv_output_dir / scenario.csv_design_filename, scenario.csv_test_file)
+                for scenario in self.parsed_scenarios
+                if scenario.csv_test_file and scenario.csv_design_filename
+            ]
+
+            def write_csv_test_file(task: Tuple[Path, str]) -> None:
+                output_filepath, content = task
+                output_filepath.write_text(content, encoding="utf-8")
+
+            # Write CSV test files; many files are written in parallel to overlap disk I/O
+            if len(tasks) >= self.CSV_PARALLEL_WRITE_THRESHOLD:
+                with ThreadPoolExecutor(max_workers=min(16, len(tasks))) as executor:
+                    list(executor.map(write_csv_test_file, tasks))
+            else:
+                for task in tasks:
+                    write_csv_test_file(task)
         except Exception as e:
-            t = TRANSLATIONS[self.current_language]
+            t = self._t
             QMessageBox.warning(
                 self,
                 t["error"],
@@ -2858,48 +2828,74 @@ class MainWindow(QMainWindow):
     def change_language(self, language: str) -> None:
         """Change interface language"""
         if language != self.current_language:
-            self.current_language = language
+            self._set_current_language(language)
             self.update_ui_texts()
             self.config_manager.save_language(language)
             
-            # Re-parse spreadsheet with new language to update error messages
-            if self.spreadsheet_path:
+            # Parse results themselves do not depend on the language, only
+            # the error messages do. Re-parse just the sources whose last
+            # parse produced an error, so the message is rebuilt in the new
+            # language; successful parses are kept as they are.
+            if self.spreadsheet_path and self.spreadsheet_parse_error:
                 self._parse_spreadsheet()
-            
-            # Re-parse TOMMM with new language to update error messages
-            # Save CSV archive parse status before re-parsing TOMMM
+
+            # Re-parsing TOMMM replaces parsed_scenarios and drops the CSV data
+            # added to them, so a successfully parsed CSV archive is re-parsed
+            # after it. Save CSV archive parse status before re-parsing TOMMM.
             csv_archive_was_parsed = self.csv_archive_parse_success is True
             csv_archive_path_saved = self.csv_archive_path
-            
-            if self.tnc_platform_path:
+            tnc_reparsed = False
+
+            if self.tnc_platform_path and self.tnc_parse_error:
                 self._parse_tnc_file()
-            
-            # Re-parse CSV archive if it was successfully parsed before
-            # This preserves CSV data that was added to scenarios
-            if csv_archive_was_parsed and csv_archive_path_saved and self.parsed_scenarios:
-                self._parse_csv_archive()
+                tnc_reparsed = True
+
+            if csv_archive_path_saved and self.parsed_scenarios:
+                if (tnc_reparsed and csv_archive_was_parsed) or self.csv_archive_parse_error:
+                    self._parse_csv_archive()
+
+            # Status tooltips of the sources that were not re-parsed
+            self._update_spreadsheet_status_icon()
+            self._update_tnc_status_icon()
+            self._update_csv_archive_status_icon()
+
+            # Re-parsed sources may have changed the overall parse state
+            self.update_process_button_state()
 
     def load_language(self) -> None:
         """Load last selected language from configuration"""
         language = self.config_manager.get_language()
         if language in ["UA", "EN"]:
-            self.current_language = language
+            self._set_current_language(language)
             # Temporarily disable signal to avoid double call
             self.language_combo.blockSignals(True)
             self.language_combo.setCurrentText(language)
             self.language_combo.blockSignals(False)
 
+    def _set_current_language(self, language: str) -> None:
+        """Switch current language and the texts derived from it"""
+        self.current_language = language
+        self._t = TRANSLATIONS[language]
+        self._not_selected_plain = self._t["not_selected"]
+        self._not_selected_red_html = f'<span style="color: red;">{self._not_selected_plain}</span>'
+
     def _set_not_selected_label(self, label: QLabel, is_required: bool) -> None:
         """Set 'Not selected' text with red color for required fields"""
-        t = TRANSLATIONS[self.current_language]
-        if is_required:
-            label.setText(f'<span style="color: red;">{t["not_selected"]}</span>')
-        else:
-            label.setText(t["not_selected"])
+        label.setText(self._not_selected_red_html if is_required else self._not_selected_plain)
 
     def update_ui_texts(self) -> None:
         """Update all interface texts according to selected language"""
-        t = TRANSLATIONS[self.current_language]
+        # Suspend repainting while ~30 texts change, so the window is repainted
+        # once when updates are enabled again
+        self.setUpdatesEnabled(False)
+        try:
+            self._apply_ui_texts()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _apply_ui_texts(self) -> None:
+        """Set all interface texts from the active translation dictionary"""
+        t = self._t
 
         # Window title
         self.setWindowTitle(t["window_title"])
@@ -2977,10 +2973,18 @@ class MainWindow(QMainWindow):
         # Enable Items button only when parsing is successful and items exist
         self.show_items_button.setEnabled(bool(self.parsed_items) and bool(self.spreadsheet_parse_success))
     
+    def _set_parse_status_state(self, button: QPushButton, success: bool) -> None:
+        """Show success/error state on a parse status button (colors come from STATUS_BUTTON_STYLE)"""
+        t = self._t
+        button.setText("✓" if success else "✗")
+        button.setToolTip(t["tooltip_parse_success"] if success else t["tooltip_parse_error"])
+        button.setProperty("parseState", "ok" if success else "error")
+        # Re-apply stylesheet rules that depend on the parseState property
+        button.style().unpolish(button)
+        button.style().polish(button)
+
     def _update_spreadsheet_status_icon(self) -> None:
         """Update spreadsheet parsing status button"""
-        t = TRANSLATIONS[self.current_language]
-        
         if self.spreadsheet_parse_success is None:
             self.spreadsheet_status_button.hide()
             return
@@ -2989,50 +2993,14 @@ class MainWindow(QMainWindow):
         
         if self.spreadsheet_parse_success:
             # Subtle green button with checkmark (success)
-            self.spreadsheet_status_button.setText("✓")
-            self.spreadsheet_status_button.setToolTip(t["tooltip_parse_success"])
-            self.spreadsheet_status_button.setStyleSheet(
-                "QPushButton {"
-                "  background-color: #e8f5e9; "
-                "  color: #2e7d32; "
-                "  font-weight: bold; "
-                "  font-size: 16px; "
-                "  border: none; "
-                "  border-radius: 3px; "
-                "  padding: 2px;"
-                "}"
-                "QPushButton:hover {"
-                "  background-color: #c8e6c9; "
-                "}"
-                "QPushButton:pressed {"
-                "  background-color: #a5d6a7; "
-                "}"
-            )
+            self._set_parse_status_state(self.spreadsheet_status_button, True)
         else:
             # Subtle red button with X (error)
-            self.spreadsheet_status_button.setText("✗")
-            self.spreadsheet_status_button.setToolTip(t["tooltip_parse_error"])
-            self.spreadsheet_status_button.setStyleSheet(
-                "QPushButton {"
-                "  background-color: #ffebee; "
-                "  color: #c62828; "
-                "  font-weight: bold; "
-                "  font-size: 16px; "
-                "  border: none; "
-                "  border-radius: 3px; "
-                "  padding: 2px;"
-                "}"
-                "QPushButton:hover {"
-                "  background-color: #ffcdd2; "
-                "}"
-                "QPushButton:pressed {"
-                "  background-color: #ef9a9a; "
-                "}"
-            )
+            self._set_parse_status_state(self.spreadsheet_status_button, False)
     
     def _show_spreadsheet_parse_status(self) -> None:
         """Show spreadsheet parsing status message"""
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         
         if self.spreadsheet_parse_success is None:
             return
@@ -3059,16 +3027,20 @@ class MainWindow(QMainWindow):
             if (self.csv_archive_parse_success and self.tnc_parse_success and 
                 self.spreadsheet_parse_success and self.csv_archive_path):
                 self._regenerate_csv_test_files()
+        self.update_process_button_state()
     
     def _parse_csv_archive(self) -> None:
         """Parse selected CSV archive file"""
         if not self.csv_archive_path:
             return
+
+        # Scenarios get new CSV designs and test files from the archive
+        self._last_csv_regeneration = (None, None)
         
         # Check if TNC scenarios are parsed
         if not self.parsed_scenarios:
             self.csv_archive_parse_success = False
-            self.csv_archive_parse_error = TRANSLATIONS[self.current_language].get(
+            self.csv_archive_parse_error = self._t.get(
                 "csv_no_scenarios", 
                 "Please parse TOMMM file first"
             )
@@ -3094,8 +3066,6 @@ class MainWindow(QMainWindow):
     
     def _update_csv_archive_status_icon(self) -> None:
         """Update CSV archive parsing status button"""
-        t = TRANSLATIONS[self.current_language]
-        
         if self.csv_archive_parse_success is None:
             self.csv_archive_status_button.hide()
             # Even without CSV parsing, enable scenarios button if scenarios are parsed
@@ -3106,54 +3076,18 @@ class MainWindow(QMainWindow):
         
         if self.csv_archive_parse_success:
             # Subtle green button with checkmark (success)
-            self.csv_archive_status_button.setText("✓")
-            self.csv_archive_status_button.setToolTip(t["tooltip_parse_success"])
-            self.csv_archive_status_button.setStyleSheet(
-                "QPushButton {"
-                "  background-color: #e8f5e9; "
-                "  color: #2e7d32; "
-                "  font-weight: bold; "
-                "  font-size: 16px; "
-                "  border: none; "
-                "  border-radius: 3px; "
-                "  padding: 2px;"
-                "}"
-                "QPushButton:hover {"
-                "  background-color: #c8e6c9; "
-                "}"
-                "QPushButton:pressed {"
-                "  background-color: #a5d6a7; "
-                "}"
-            )
+            self._set_parse_status_state(self.csv_archive_status_button, True)
             # CSV parsed successfully; enable scenarios button when scenarios are parsed
             self.show_scenarios_button.setEnabled(bool(self.parsed_scenarios))
         else:
             # Subtle red button with X (error)
-            self.csv_archive_status_button.setText("✗")
-            self.csv_archive_status_button.setToolTip(t["tooltip_parse_error"])
-            self.csv_archive_status_button.setStyleSheet(
-                "QPushButton {"
-                "  background-color: #ffebee; "
-                "  color: #c62828; "
-                "  font-weight: bold; "
-                "  font-size: 16px; "
-                "  border: none; "
-                "  border-radius: 3px; "
-                "  padding: 2px;"
-                "}"
-                "QPushButton:hover {"
-                "  background-color: #ffcdd2; "
-                "}"
-                "QPushButton:pressed {"
-                "  background-color: #ef9a9a; "
-                "}"
-            )
+            self._set_parse_status_state(self.csv_archive_status_button, False)
             # Even if CSV parsing failed, enable scenarios button when scenarios are parsed
             self.show_scenarios_button.setEnabled(bool(self.parsed_scenarios))
     
     def _show_csv_archive_parse_status(self) -> None:
         """Show CSV archive parsing status message"""
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         
         if self.csv_archive_parse_success is None:
             return
@@ -3176,45 +3110,64 @@ class MainWindow(QMainWindow):
         """Refresh CSV archive parsing data"""
         if self.csv_archive_path:
             self._parse_csv_archive()
+        self.update_process_button_state()
 
-    def _get_csv_inbound_enabled_mask(self) -> List[bool]:
-        """Return a boolean mask for which Items are enabled for CSV inbound generation.
+    def _get_csv_inbound_disabled_indices(self) -> FrozenSet[int]:
+        """Return positions of Items that are disabled for CSV inbound generation.
 
         If settings are missing or length does not match, all items are treated as enabled.
+        The result is cached until the saved enabled_items list is replaced.
         """
         total = len(self.parsed_items)
-        if total == 0:
-            return []
-
         settings = self.artifact_settings.get("csv_inbound_settings", {})
         saved = settings.get("enabled_items")
 
-        if isinstance(saved, list) and len(saved) == total:
-            return [bool(v) for v in saved]
+        cached_saved, cached_total, cached_disabled = self._csv_disabled_indices_cache
+        if saved is cached_saved and total == cached_total:
+            return cached_disabled
 
-        # Default: all items enabled
-        return [True] * total
+        if total and isinstance(saved, list) and len(saved) == total:
+            disabled = frozenset(idx for idx, enabled in enumerate(saved) if not enabled)
+        else:
+            # Default: all items enabled
+            disabled = frozenset()
 
-    def _get_csv_items_for_generation(self) -> List[Item]:
+        # The saved list itself is kept in the cache, so its identity cannot be reused
+        self._csv_disabled_indices_cache = (saved, total, disabled)
+        return disabled
+
+    def _get_csv_items_for_generation(self, disabled: Optional[FrozenSet[int]] = None) -> List[Item]:
         """Return a cloned Items list for CSV generation.
 
         Disabled items keep their position but have empty tli_value so that
         CSV structure (number of columns) remains unchanged, and those
-        positions become just empty values between commas.
+        positions become just empty values between commas. The list is
+        cached and shared between calls, so callers must not modify it.
+        Callers that already looked up the disabled positions may pass them in.
         """
         if not self.parsed_items:
             return []
 
-        mask = self._get_csv_inbound_enabled_mask()
+        if disabled is None:
+            disabled = self._get_csv_inbound_disabled_indices()
+
+        # Reuse the projection while neither parsed_items nor the disabled positions changed
+        if self._csv_items_cache is not None:
+            cached_items, cached_disabled, cached_copy = self._csv_items_cache
+            if cached_items is self.parsed_items and cached_disabled == disabled:
+                return cached_copy
 
-        # Deep-copy items so we don't mutate original parsed_items
-        items_copy: List[Item] = copy.deepcopy(self.parsed_items)
+        # Shallow copies are enough: CSV generation only reads the items and
+        # only tli_value of disabled items differs from original parsed_items
+        items_copy: List[Item] = [copy.copy(item) for item in self.parsed_items]
 
-        for idx, enabled in enumerate(mask):
-            if not enabled and idx < len(items_copy):
-                # Empty value for disabled items
-                items_copy[idx].tli_value = ""
+        for idx in disabled:
+            # Empty value for disabled items (derived TLI value data recomputed too)
+            item_copy = items_copy[idx]
+            item_copy.tli_value = ""
+            item_copy.precompute_rsx_data()
 
+        self._csv_items_cache = (self.parsed_items, disabled, items_copy)
         return items_copy
     
     def _regenerate_csv_test_files(self) -> None:
@@ -3222,27 +3175,48 @@ class MainWindow(QMainWindow):
         if not self.parsed_scenarios or not self.parsed_items:
             return
         
+        # Prepare items list for CSV generation, applying CSV inbound settings
+        disabled = self._get_csv_inbound_disabled_indices()
+        items_for_csv = self._get_csv_items_for_generation(disabled)
+
+        # The items projection is cached, so the same list object means that
+        # neither the items nor the disabled positions changed since the last
+        # regeneration of these scenarios
+        last_scenarios, last_items = self._last_csv_regeneration
+        if last_scenarios is self.parsed_scenarios and last_items is items_for_csv:
+            return
+
         parser = CSVArchiveParser(self.current_language)
         errors = []
-        
-        # Prepare items list for CSV generation, applying CSV inbound settings
-        items_for_csv = self._get_csv_items_for_generation()
 
-        for scenario in self.parsed_scenarios:
-            if not scenario.csv_design:
-                continue
-            
+        def regenerate(scenario: InboundDocScenario) -> Tuple[Optional[str], List[str]]:
+            """Build the CSV test file of one scenario, collecting its errors separately."""
+            scenario_errors: List[str] = []
             try:
-                import csv
-                import io
-                csv_reader = csv.reader(io.StringIO(scenario.csv_design))
-                csv_rows = list(csv_reader)
-                
-                csv_test_content = parser._generate_csv_test_file(csv_rows, items_for_csv, errors)
-                scenario.csv_test_file = csv_test_content
+                # Rows were parsed once when the CSV archive was loaded
+                content = parser._generate_csv_test_file(scenario.csv_rows, items_for_csv, scenario_errors)
             except Exception as e:
-                errors.append(f"Error regenerating test file for scenario {scenario.key}: {str(e)}")
+                scenario_errors.append(f"Error regenerating test file for scenario {scenario.key}: {str(e)}")
+                return None, scenario_errors
+            return content, scenario_errors
+
+        scenarios = [scenario for scenario in self.parsed_scenarios if scenario.csv_design]
+
+        # Scenarios are independent (items_for_csv is only read), so many of them are regenerated in parallel
+        if len(scenarios) >= self.CSV_PARALLEL_WRITE_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=min(16, len(scenarios))) as executor:
+                results = list(executor.map(regenerate, scenarios))
+        else:
+            results = [regenerate(scenario) for scenario in scenarios]
+
+        # Apply results and errors in scenario order
+        for scenario, (content, scenario_errors) in zip(scenarios, results):
+            if content is not None:
+                scenario.csv_test_file = content
+            errors.extend(scenario_errors)
         
+        self._last_csv_regeneration = (self.parsed_scenarios, items_for_csv)
+
         # Update status if there were errors
         if errors:
             self.csv_archive_parse_error = "\n".join(errors)
@@ -3278,6 +3252,7 @@ class MainWindow(QMainWindow):
         
         parser = TOMMMParser(self.current_language)
         scenarios, company_name, error_message = parser.parse(self.tnc_platform_path)
+        self._last_csv_regeneration = (None, None)
         
         self.parsed_scenarios = scenarios
         self.tnc_company_name = company_name
@@ -3293,8 +3268,6 @@ class MainWindow(QMainWindow):
     
     def _update_tnc_status_icon(self) -> None:
         """Update TOMMM parsing status button"""
-        t = TRANSLATIONS[self.current_language]
-        
         if self.tnc_parse_success is None:
             self.tnc_status_button.hide()
             return
@@ -3303,56 +3276,20 @@ class MainWindow(QMainWindow):
         
         if self.tnc_parse_success:
             # Subtle green button with checkmark (success)
-            self.tnc_status_button.setText("✓")
-            self.tnc_status_button.setToolTip(t["tooltip_parse_success"])
-            self.tnc_status_button.setStyleSheet(
-                "QPushButton {"
-                "  background-color: #e8f5e9; "
-                "  color: #2e7d32; "
-                "  font-weight: bold; "
-                "  font-size: 16px; "
-                "  border: none; "
-                "  border-radius: 3px; "
-                "  padding: 2px;"
-                "}"
-                "QPushButton:hover {"
-                "  background-color: #c8e6c9; "
-                "}"
-                "QPushButton:pressed {"
-                "  background-color: #a5d6a7; "
-                "}"
-            )
+            self._set_parse_status_state(self.tnc_status_button, True)
             # Show scenarios button if there are parsed scenarios
             if self.parsed_scenarios:
                 self.show_scenarios_button.show()
                 self.show_scenarios_button.setEnabled(True)
         else:
             # Subtle red button with X (error)
-            self.tnc_status_button.setText("✗")
-            self.tnc_status_button.setToolTip(t["tooltip_parse_error"])
-            self.tnc_status_button.setStyleSheet(
-                "QPushButton {"
-                "  background-color: #ffebee; "
-                "  color: #c62828; "
-                "  font-weight: bold; "
-                "  font-size: 16px; "
-                "  border: none; "
-                "  border-radius: 3px; "
-                "  padding: 2px;"
-                "}"
-                "QPushButton:hover {"
-                "  background-color: #ffcdd2; "
-                "}"
-                "QPushButton:pressed {"
-                "  background-color: #ef9a9a; "
-                "}"
-            )
+            self._set_parse_status_state(self.tnc_status_button, False)
             # On TNC parse error, disable (but do not hide) scenarios button
             self.show_scenarios_button.setEnabled(False)
     
     def _show_tnc_parse_status(self) -> None:
         """Show TOMMM parsing status message"""
-        t = TRANSLATIONS[self.current_language]
+        t = self._t
         
         if self.tnc_parse_success is None:
             return
@@ -3375,35 +3312,19 @@ class MainWindow(QMainWindow):
         """Refresh TOMMM parsing data"""
         if self.tnc_platform_path:
             self._parse_tnc_file()
+        self.update_process_button_state()
     
     def _set_window_icon(self) -> None:
         """Set window icon from file or use default"""
         # Try to load icon from application folder
-        icon_path = Path(__file__).parent / "icon.ico"
-        if icon_path.exists():
-            self.setWindowIcon(QIcon(str(icon_path)))
-        else:
+        if ICON_ICO_PATH.exists():
+            self.setWindowIcon(QIcon(str(ICON_ICO_PATH)))
+        elif ICON_PNG_PATH.exists():
             # Try PNG as fallback
-            icon_path = Path(__file__).parent / "icon.png"
-            if icon_path.exists():
-                self.setWindowIcon(QIcon(str(icon_path)))
-            else:
-                # Create a simple default icon if no file exists
-                pixmap = QPixmap(32, 32)
-                pixmap.fill(Qt.GlobalColor.transparent)
-                # Draw a simple "T" letter as default icon
-                from PyQt6.QtGui import QPainter, QColor
-                painter = QPainter(pixmap)
-                painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-                painter.fillRect(0, 0, 32, 32, QColor(33, 150, 243))  # Blue background
-                painter.setPen(QColor(255, 255, 255))  # White text
-                font = QFont()
-                font.setPointSize(20)
-                font.setBold(True)
-                painter.setFont(font)
-                painter.drawText(0, 0, 32, 32, Qt.AlignmentFlag.AlignCenter, "T")
-                painter.end()
-                self.setWindowIcon(QIcon(pixmap))
+            self.setWindowIcon(QIcon(str(ICON_PNG_PATH)))
+        else:
+            # Use a simple default icon if no file exists
+            self.setWindowIcon(_default_app_icon())
     
     def open_items_editor(self) -> None:
         """Open Items Properties Editor"""
@@ -1,21 +1,22 @@
 """Dialog for displaying scenario information"""
 
-from typing import List
+import functools
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
 from PyQt6.QtWidgets import (
     QDialog,
     QDialogButtonBox,
     QGroupBox,
     QHBoxLayout,
     QLabel,
+    QPlainTextEdit,
     QPushButton,
     QScrollArea,
-    QTextEdit,
     QVBoxLayout,
     QWidget,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
     QAbstractItemView,
 )
@@ -24,8 +25,219 @@ from application.tommm_parser import InboundDocScenario
 from application.translations import TRANSLATIONS
 
 
+@functools.lru_cache(maxsize=None)
+def _scenario_field_descriptions(language: str) -> Dict[str, str]:
+    """Return (once per language) scenario field descriptions keyed by field name.
+
+    The dictionary is shared between dialogs and must not be modified.
+    """
+    t = TRANSLATIONS.get(language, TRANSLATIONS["UA"])
+    return {
+        "name": t.get("scenario_name", "Name"),
+        "key": t.get("scenario_key", "Key"),
+        "document_number": t.get("scenario_document_number", "Document Number"),
+        "tset_code": t.get("scenario_tset_code", "TSET Code"),
+        "number_of_tli": t.get("scenario_number_of_tli", "Number of TLI"),
+        "number_of_lines": t.get("scenario_number_of_lines", "Number of Lines"),
+        "includes_855_docs": t.get("scenario_includes_855_docs", "Includes 855 Docs"),
+        "includes_856_docs": t.get("scenario_includes_856_docs", "Includes 856 Docs"),
+        "includes_810_docs": t.get("scenario_includes_810_docs", "Includes 810 Docs"),
+        "is_changed_by_850_scenario": t.get("scenario_is_changed_by_850_scenario", "Is Changed by 850 Scenario"),
+        "is_changer_850": t.get("scenario_is_changer_850", "Is Changer 850"),
+        "is_consolidated": t.get("scenario_is_consolidated", "Is Consolidated"),
+        "csv_design_filename": t.get("scenario_csv_design_filename", "CSV Design File Name"),
+        "csv_design": t.get("scenario_csv_design", "CSV Design"),
+        "csv_test_file": t.get("scenario_csv_test_file", "CSV Test File"),
+        "key_with_date": t.get("scenario_key_with_date", "Key (with date mask)"),
+    }
+
+
+class ScenarioFieldsModel(QAbstractTableModel):
+    """Read-only model of scenario details rows (description, value)"""
+
+    def __init__(self, rows: List[Tuple[str, str, str]], parent=None):
+        """
+        Initialize model
+
+        Args:
+            rows: (description, value, CSV content field) rows; CSV content
+                rows have no value text, their cell holds a Show Content button
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._rows = rows
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        label_text, value_text, content_field = self._rows[index.row()]
+        if index.column() == 0:
+            return label_text
+        return None if content_field else value_text
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        # Not editable
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+
+class CSVContentDialog(QDialog):
+    """Read-only CSV content viewer; large content is shown page by page"""
+
+    # Content longer than this (in characters) is split into pages
+    PAGE_THRESHOLD = 256 * 1024
+    # Number of CSV lines per page
+    PAGE_LINES = 4000
+
+    def __init__(self, t: Dict[str, str], parent=None):
+        """
+        Initialize dialog
+
+        Args:
+            t: Translation dictionary of the current UI language
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.setMinimumSize(900, 600)
+        self._content = ""
+        # Start offsets of pages in _content
+        self._page_starts: List[int] = [0]
+        self._page = 0
+
+        layout = QVBoxLayout(self)
+
+        self.text_edit = QPlainTextEdit()
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setUndoRedoEnabled(False)
+        self.text_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.text_edit)
+
+        # Page navigation (shown only for paged content)
+        self.navigation_widget = QWidget()
+        navigation_layout = QHBoxLayout(self.navigation_widget)
+        navigation_layout.setContentsMargins(0, 0, 0, 0)
+        self.previous_button = QPushButton(t.get("previous_page", "Previous"))
+        self.previous_button.clicked.connect(lambda: self._show_page(self._page - 1))
+        navigation_layout.addWidget(self.previous_button)
+        self.page_label = QLabel()
+        self.page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        navigation_layout.addWidget(self.page_label, stretch=1)
+        self.next_button = QPushButton(t.get("next_page", "Next"))
+        self.next_button.clicked.connect(lambda: self._show_page(self._page + 1))
+        navigation_layout.addWidget(self.next_button)
+        layout.addWidget(self.navigation_widget)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def set_content(self, content: str, title: str) -> None:
+        """Show content with given window title, starting from its first page"""
+        self.setWindowTitle(title)
+        self._content = content
+
+        # Pages are kept as offsets into content, so no page text is copied
+        # until it is shown
+        page_starts = [0]
+        if len(content) > self.PAGE_THRESHOLD:
+            position = 0
+            while True:
+                for _ in range(self.PAGE_LINES):
+                    position = content.find("\n", position) + 1
+                    if not position:
+                        break
+                if not position or position >= len(content):
+                    break
+                page_starts.append(position)
+        self._page_starts = page_starts
+
+        self.navigation_widget.setVisible(len(page_starts) > 1)
+        self._show_page(0)
+
+    def clear_content(self) -> None:
+        """Drop shown content"""
+        self._content = ""
+        self._page_starts = [0]
+        self.text_edit.clear()
+
+    def _show_page(self, page: int) -> None:
+        """Show page with given index"""
+        page_count = len(self._page_starts)
+        self._page = page
+        end = self._page_starts[page + 1] if page + 1 < page_count else len(self._content)
+        self.text_edit.setPlainText(self._content[self._page_starts[page]:end])
+        self.page_label.setText(f"{page + 1} / {page_count}")
+        self.previous_button.setEnabled(page > 0)
+        self.next_button.setEnabled(page + 1 < page_count)
+
+
 class ScenariosInfoDialog(QDialog):
     """Dialog for displaying scenario information"""
+
+    # Checkbox/border style of scenario groups, matching ItemsInfoDialog.
+    # Set once on the dialog, so all scenario groups share one parsed stylesheet.
+    SCENARIO_GROUP_STYLE = (
+        "QGroupBox {"
+        "    font-weight: bold;"
+        "    border: 2px solid #cccccc;"
+        "    border-radius: 5px;"
+        "    margin-top: 3px;"
+        "    margin-bottom: 3px;"
+        "    padding-top: 5px;"
+        "    padding-bottom: 3px;"
+        "}"
+        "QGroupBox::indicator {"
+        "    width: 20px;"
+        "    height: 20px;"
+        "}"
+        "QGroupBox::indicator:unchecked {"
+        "    image: none;"
+        "    background-color: #e0e0e0;"
+        "    border: 2px solid #999999;"
+        "    border-radius: 3px;"
+        "}"
+        "QGroupBox::indicator:checked {"
+        "    image: none;"
+        "    background-color: #4CAF50;"
+        "    border: 2px solid #2e7d32;"
+        "    border-radius: 3px;"
+        "}"
+        "QGroupBox::indicator:unchecked:hover {"
+        "    background-color: #d0d0d0;"
+        "}"
+        "QGroupBox::indicator:checked:hover {"
+        "    background-color: #45a049;"
+        "}"
+    )
+
+    # Number of scenario groups created at once; further groups are created
+    # only when the list is scrolled close to its end
+    SCENARIO_BATCH_SIZE = 50
+
+    # Scenario attributes shown in the details table, grouped in display order
+    # (field description keys match the attribute names).
+    # Always shown
+    BASIC_FIELDS = ("name", "key", "document_number")
+    # Shown only when the CSV archive was parsed
+    CSV_COUNT_FIELDS = ("tset_code", "number_of_tli", "number_of_lines")
+    # CSV contents shown with Show Content buttons, when not empty
+    CSV_CONTENT_FIELDS = ("csv_design", "csv_test_file")
+    # Boolean scenario attributes shown as Yes/No rows
+    FLAG_FIELDS = (
+        "includes_855_docs",
+        "includes_856_docs",
+        "includes_810_docs",
+        "is_changed_by_850_scenario",
+        "is_changer_850",
+        "is_consolidated",
+    )
+    # Reads all flag values of a scenario in one call
+    _flag_values = staticmethod(attrgetter(*FLAG_FIELDS))
     
     def __init__(
         self, 
@@ -51,279 +263,229 @@ class ScenariosInfoDialog(QDialog):
         self.setWindowTitle(self.t.get("scenarios_info_title", "Scenario Information"))
         # Width reduced by 20% (1200 * 0.8 = 960), height by 30% (600 * 1.3 = 780)
         self.setMinimumSize(960, 780)
+
+        # Field descriptions mapping (shared by all dialogs of the same language)
+        self._field_descriptions = _scenario_field_descriptions(current_language)
+        self._show_content_text = self.t.get("show_content", "Show Content")
+        # CSV content viewer, created on first Show Content click
+        self._csv_content_dialog: Optional[CSVContentDialog] = None
+        # Texts of flag values, indexed by the flag value
+        self._flag_texts = (self.t.get("no", "No"), self.t.get("yes", "Yes"))
+
         self.create_ui()
     
-    def _wrap_text(self, text: str, max_length: int = 30) -> str:
-        """
-        Wrap text to multiple lines if it exceeds max_length
-        
-        Args:
-            text: Text to wrap
-            max_length: Maximum length per line
-            
-        Returns:
-            Text with line breaks inserted
-        """
-        if len(text) <= max_length:
-            return text
-        
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            if len(current_line) + len(word) + 1 <= max_length:
-                if current_line:
-                    current_line += " " + word
-                else:
-                    current_line = word
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return "\n".join(lines)
-    
     def create_ui(self) -> None:
         """Create user interface"""
-        layout = QVBoxLayout()
-        self.setLayout(layout)
+        layout = QVBoxLayout(self)
+        self.setStyleSheet(self.SCENARIO_GROUP_STYLE)
         
-        scroll = QWidget()
-        scroll_layout = QVBoxLayout()
-        scroll.setLayout(scroll_layout)
+        self._scenario_list = QWidget()
+        self._scenario_list_layout = QVBoxLayout(self._scenario_list)
+        self._scenario_list_layout.addStretch()
+        # Number of scenarios whose groups are already created
+        self._created_scenario_count = 0
+        # Scenario index -> expanded details widget (created on first expand)
+        self._scenario_details: Dict[int, QWidget] = {}
         
-        # Field descriptions mapping
-        field_descriptions = {
-            "name": self.t.get("scenario_name", "Name"),
-            "key": self.t.get("scenario_key", "Key"),
-            "document_number": self.t.get("scenario_document_number", "Document Number"),
-            "tset_code": self.t.get("scenario_tset_code", "TSET Code"),
-            "number_of_tli": self.t.get("scenario_number_of_tli", "Number of TLI"),
-            "number_of_lines": self.t.get("scenario_number_of_lines", "Number of Lines"),
-            "includes_855_docs": self.t.get("scenario_includes_855_docs", "Includes 855 Docs"),
-            "includes_856_docs": self.t.get("scenario_includes_856_docs", "Includes 856 Docs"),
-            "includes_810_docs": self.t.get("scenario_includes_810_docs", "Includes 810 Docs"),
-            "is_changed_by_850_scenario": self.t.get("scenario_is_changed_by_850_scenario", "Is Changed by 850 Scenario"),
-            "is_changer_850": self.t.get("scenario_is_changer_850", "Is Changer 850"),
-            "is_consolidated": self.t.get("scenario_is_consolidated", "Is Consolidated"),
-            "csv_design_filename": self.t.get("scenario_csv_design_filename", "CSV Design File Name"),
-            "csv_design": self.t.get("scenario_csv_design", "CSV Design"),
-            "csv_test_file": self.t.get("scenario_csv_test_file", "CSV Test File"),
-        }
-        
-        # Display each scenario
-        for idx, scenario in enumerate(self.scenarios):
-            # Create collapsible group box with compact header (like ItemsInfoDialog)
-            scenario_group = QGroupBox()
-            scenario_group.setCheckable(True)
-            scenario_group.setChecked(False)  # Collapsed by default
-
-            # Header with basic info (always visible): number and name on first line
-            header_text = f"{idx + 1}. {scenario.name}"
-            scenario_group.setTitle(header_text)
-
-            # Match checkbox/border style with ItemsInfoDialog
-            scenario_group.setStyleSheet(
-                "QGroupBox {"
-                "    font-weight: bold;"
-                "    border: 2px solid #cccccc;"
-                "    border-radius: 5px;"
-                "    margin-top: 3px;"
-                "    margin-bottom: 3px;"
-                "    padding-top: 5px;"
-                "    padding-bottom: 3px;"
-                "}"
-                "QGroupBox::indicator {"
-                "    width: 20px;"
-                "    height: 20px;"
-                "}"
-                "QGroupBox::indicator:unchecked {"
-                "    image: none;"
-                "    background-color: #e0e0e0;"
-                "    border: 2px solid #999999;"
-                "    border-radius: 3px;"
-                "}"
-                "QGroupBox::indicator:checked {"
-                "    image: none;"
-                "    background-color: #4CAF50;"
-                "    border: 2px solid #2e7d32;"
-                "    border-radius: 3px;"
-                "}"
-                "QGroupBox::indicator:unchecked:hover {"
-                "    background-color: #d0d0d0;"
-                "}"
-                "QGroupBox::indicator:checked:hover {"
-                "    background-color: #45a049;"
-                "}"
-            )
+        self._scroll_area = QScrollArea()
+        self._scroll_area.setWidget(self._scenario_list)
+        self._scroll_area.setWidgetResizable(True)
+        layout.addWidget(self._scroll_area)
 
-            scenario_layout = QVBoxLayout()
-            # similar compact margins as in ItemsInfoDialog
-            scenario_layout.setContentsMargins(28, 8, 8, 2)
-            scenario_layout.setSpacing(0)
-            scenario_group.setLayout(scenario_layout)
-
-            # Second line with key and document number (always visible in collapsed view)
-            # Compact, aligned with title text
-            second_line_layout = QHBoxLayout()
-            second_line_layout.setContentsMargins(18, 3, 0, 0)
-            second_line_layout.setSpacing(0)
-            key_doc_label = QLabel(f"{self.t.get('scenario_key', 'Key')}={scenario.key}, {self.t.get('scenario_document_number', 'Document Number')}={scenario.document_number}")
-            key_doc_label.setStyleSheet("color: #666666; font-size: 9pt; margin: 0px; padding: 0px;")
-            second_line_layout.addWidget(key_doc_label)
-            second_line_layout.addStretch()
-            scenario_layout.addLayout(second_line_layout)
-            
-            # Expanded content (hidden by default, shown when checked)
-            expanded_widget = QWidget()
-            expanded_layout = QVBoxLayout()
-            expanded_widget.setLayout(expanded_layout)
-
-            table = QTableWidget()
-            table.setColumnCount(2)
-            table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-            table.horizontalHeader().setVisible(False)
-            table.verticalHeader().setVisible(False)
-            table.setShowGrid(True)
-            table.setAlternatingRowColors(True)
-            header = table.horizontalHeader()
-            header.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
-            header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-
-            current_row = 0
-
-            def add_simple_row(label_text: str, value_text: str) -> None:
-                nonlocal current_row
-                table.insertRow(current_row)
-                # Keep description in a single line
-                desc_item = QTableWidgetItem(label_text)
-                desc_item.setFlags(desc_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                table.setItem(current_row, 0, desc_item)
-                value_item = QTableWidgetItem(value_text)
-                value_item.setFlags(value_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                table.setItem(current_row, 1, value_item)
-                current_row += 1
-
-            def add_button_row(label_text: str, content: str, title: str) -> None:
-                nonlocal current_row
-                table.insertRow(current_row)
-                # Keep description in a single line
-                desc_item = QTableWidgetItem(label_text)
-                desc_item.setFlags(desc_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                table.setItem(current_row, 0, desc_item)
-                button = QPushButton(self.t.get("show_content", "Show Content"))
-                button.setFixedWidth(140)
-                button.setFixedHeight(24)
-                button.clicked.connect(
-                    lambda checked, text=content, ttitle=title: self._show_csv_content(text, ttitle)
-                )
-                table.setCellWidget(current_row, 1, button)
-                current_row += 1
-
-            # Name field
-            add_simple_row(field_descriptions["name"], scenario.name)
-
-            # Key field
-            add_simple_row(field_descriptions["key"], scenario.key)
-
-            # Document number field
-            add_simple_row(field_descriptions["document_number"], str(scenario.document_number))
-
-            # key_with_date if present
-            if scenario.key_with_date:
-                add_simple_row(self.t.get("scenario_key_with_date", "Key (with date mask)"), scenario.key_with_date)
-
-            # TSET Code and basic counts (only if CSV parsing was successful)
-            if self.csv_parse_success:
-                add_simple_row(field_descriptions["tset_code"], str(scenario.tset_code) if scenario.tset_code else "")
-                add_simple_row(field_descriptions["number_of_tli"], str(scenario.number_of_tli))
-                add_simple_row(field_descriptions["number_of_lines"], str(scenario.number_of_lines))
-
-            # Flags (always visible)
-            add_simple_row(field_descriptions["includes_855_docs"], "Yes" if scenario.includes_855_docs else "No")
-            add_simple_row(field_descriptions["includes_856_docs"], "Yes" if scenario.includes_856_docs else "No")
-            add_simple_row(field_descriptions["includes_810_docs"], "Yes" if scenario.includes_810_docs else "No")
-            add_simple_row(field_descriptions["is_changed_by_850_scenario"], "Yes" if scenario.is_changed_by_850_scenario else "No")
-            add_simple_row(field_descriptions["is_changer_850"], "Yes" if scenario.is_changer_850 else "No")
-            add_simple_row(field_descriptions["is_consolidated"], "Yes" if scenario.is_consolidated else "No")
-
-            # CSV design filename (from archive) if available
-            if self.csv_parse_success and getattr(scenario, "csv_design_filename", ""):
-                add_simple_row(field_descriptions["csv_design_filename"], scenario.csv_design_filename)
-
-            # CSV Design content button
-            if self.csv_parse_success and scenario.csv_design:
-                add_button_row(field_descriptions["csv_design"], scenario.csv_design, field_descriptions["csv_design"])
-
-            # CSV Test File content button
-            if self.csv_parse_success and scenario.csv_test_file:
-                add_button_row(field_descriptions["csv_test_file"], scenario.csv_test_file, field_descriptions["csv_test_file"])
-
-            # Ensure the whole table is visible (no inner scrolling) and rows have equal minimal height
-            table.setWordWrap(False)
-            table.resizeRowsToContents()
-            base_height = table.fontMetrics().height() + 8
-            for r in range(table.rowCount()):
-                if table.rowHeight(r) < base_height:
-                    table.setRowHeight(r, base_height)
-
-            # Make first column slightly narrower (about 25% less than before)
-            table.setColumnWidth(0, 270)
-
-            header_height = table.horizontalHeader().height() if table.horizontalHeader().isVisible() else 0
-            total_height = header_height + 2 * table.frameWidth()
-            for r in range(table.rowCount()):
-                total_height += table.rowHeight(r)
-            table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            table.setMinimumHeight(total_height)
-            table.setMaximumHeight(total_height)
-
-            expanded_layout.addWidget(table)
-            # Add expanded widget to group box
-            scenario_layout.addWidget(expanded_widget)
-            
-            # Connect checkbox to show/hide expanded content
-            scenario_group.toggled.connect(
-                lambda checked, widget=expanded_widget: widget.setVisible(checked)
-            )
-            
-            # Initially hide expanded content
-            expanded_widget.setVisible(False)
-            
-            scroll_layout.addWidget(scenario_group)
-        
-        scroll_layout.addStretch()
-        
-        scroll_area = QScrollArea()
-        scroll_area.setWidget(scroll)
-        scroll_area.setWidgetResizable(True)
-        layout.addWidget(scroll_area)
+        # Scenario groups are created in batches: the first one right away,
+        # the next ones when the list is scrolled or resized close to its end
+        scroll_bar = self._scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._add_scenario_groups_if_needed)
+        scroll_bar.rangeChanged.connect(self._add_scenario_groups_if_needed)
+        self._add_scenario_groups()
         
         # Close button
         buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
+
+    def _add_scenario_groups_if_needed(self, *_) -> None:
+        """Create the next batch of scenario groups if the list end is about to be shown"""
+        if self._created_scenario_count >= len(self.scenarios):
+            return
+        scroll_bar = self._scroll_area.verticalScrollBar()
+        if scroll_bar.value() >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self._add_scenario_groups()
+
+    def _add_scenario_groups(self) -> None:
+        """Create groups of the next SCENARIO_BATCH_SIZE scenarios"""
+        start = self._created_scenario_count
+        end = min(start + self.SCENARIO_BATCH_SIZE, len(self.scenarios))
+        list_layout = self._scenario_list_layout
+
+        # Suspend repainting and layout of the list while scenario groups are
+        # added, so it is laid out once after the last one
+        self._scenario_list.setUpdatesEnabled(False)
+        list_layout.setEnabled(False)
+        for idx in range(start, end):
+            # Groups go before the trailing stretch
+            list_layout.insertWidget(list_layout.count() - 1, self._create_scenario_group(idx))
+        list_layout.setEnabled(True)
+        self._scenario_list.setUpdatesEnabled(True)
+
+        self._created_scenario_count = end
+
+    def _create_scenario_group(self, idx: int) -> QGroupBox:
+        """Create collapsed group of the scenario at idx"""
+        scenario = self.scenarios[idx]
+        key_text = self._field_descriptions["key"]
+        document_number_text = self._field_descriptions["document_number"]
+
+        # Create collapsible group box with compact header (like ItemsInfoDialog)
+        scenario_group = QGroupBox()
+        scenario_group.setCheckable(True)
+        scenario_group.setChecked(False)  # Collapsed by default
+
+        # Header with basic info (always visible): number and name on first line
+        header_text = f"{idx + 1}. {scenario.name}"
+        scenario_group.setTitle(header_text)
+
+        scenario_layout = QVBoxLayout(scenario_group)
+        # similar compact margins as in ItemsInfoDialog
+        scenario_layout.setContentsMargins(28, 8, 8, 2)
+        scenario_layout.setSpacing(0)
+
+        # Second line with key and document number (always visible in collapsed view)
+        # Compact, aligned with title text
+        second_line_layout = QHBoxLayout()
+        second_line_layout.setContentsMargins(18, 3, 0, 0)
+        second_line_layout.setSpacing(0)
+        key_doc_label = QLabel(f"{key_text}={scenario.key}, {document_number_text}={scenario.document_number}")
+        key_doc_label.setStyleSheet("color: #666666; font-size: 9pt; margin: 0px; padding: 0px;")
+        second_line_layout.addWidget(key_doc_label)
+        second_line_layout.addStretch()
+        scenario_layout.addLayout(second_line_layout)
+        
+        # Connect checkbox to show/hide expanded content (created on first expand)
+        scenario_group.setProperty("scenario_index", idx)
+        scenario_group.toggled.connect(self._on_scenario_toggled)
+
+        return scenario_group
+    
+    def _on_scenario_toggled(self, checked: bool) -> None:
+        """Show or hide details of the toggled scenario group, building them on first expand"""
+        # One slot serves all scenario groups
+        scenario_group = self.sender()
+        scenario_index = scenario_group.property("scenario_index")
+        expanded_widget = self._scenario_details.get(scenario_index)
+        if expanded_widget is None:
+            if not checked:
+                return
+            expanded_widget = QWidget()
+            expanded_layout = QVBoxLayout(expanded_widget)
+            expanded_layout.addWidget(self._build_scenario_table(scenario_index))
+            scenario_group.layout().addWidget(expanded_widget)
+            self._scenario_details[scenario_index] = expanded_widget
+        expanded_widget.setVisible(checked)
+
+    def _scenario_rows(self, scenario: InboundDocScenario) -> List[Tuple[str, str, str]]:
+        """Return (description, value, CSV content field) rows of the scenario details table.
+
+        CSV content rows have an empty value and name the scenario attribute
+        whose content is shown by the Show Content button; for other rows
+        the content field is empty.
+        """
+        field_descriptions = self._field_descriptions
+
+        # Name, key and document number, then key_with_date if present
+        rows: List[Tuple[str, str, str]] = [
+            (field_descriptions[field], str(getattr(scenario, field)), "") for field in self.BASIC_FIELDS
+        ]
+        if scenario.key_with_date:
+            rows.append((field_descriptions["key_with_date"], scenario.key_with_date, ""))
+
+        # TSET Code and basic counts (only if CSV parsing was successful)
+        if self.csv_parse_success:
+            rows.extend((field_descriptions[field], str(getattr(scenario, field)), "") for field in self.CSV_COUNT_FIELDS)
+
+        # Flags (always visible)
+        flag_texts = self._flag_texts
+        rows.extend(
+            (field_descriptions[field], flag_texts[bool(value)], "")
+            for field, value in zip(self.FLAG_FIELDS, self._flag_values(scenario))
+        )
+
+        if self.csv_parse_success:
+            # CSV design filename (from archive) if available
+            if scenario.csv_design_filename:
+                rows.append((field_descriptions["csv_design_filename"], scenario.csv_design_filename, ""))
+            # Show Content buttons for non-empty CSV contents
+            rows.extend(
+                (field_descriptions[field], "", field) for field in self.CSV_CONTENT_FIELDS if getattr(scenario, field)
+            )
+
+        return rows
+
+    def _build_scenario_table(self, scenario_index: int) -> QTableView:
+        """Build the details table of the scenario at scenario_index"""
+        rows = self._scenario_rows(self.scenarios[scenario_index])
+        # Cell texts are served by the model, no per-cell items are created
+        table = QTableView()
+        model = ScenarioFieldsModel(rows, table)
+        table.setModel(model)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.horizontalHeader().setVisible(False)
+        table.verticalHeader().setVisible(False)
+        table.setShowGrid(True)
+        table.setAlternatingRowColors(True)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+
+        # Show Content buttons for CSV content rows
+        for row, (_, _, content_field) in enumerate(rows):
+            if content_field:
+                button = QPushButton(self._show_content_text)
+                button.setFixedWidth(140)
+                button.setFixedHeight(24)
+                # Content is looked up on click, the scenario stays its only owner
+                button.setProperty("scenario_index", scenario_index)
+                button.setProperty("csv_field", content_field)
+                button.clicked.connect(self._on_csv_button_clicked)
+                table.setIndexWidget(model.index(row, 1), button)
+
+        # Ensure the whole table is visible (no inner scrolling). Rows hold
+        # single-line texts, so all of them get the same fixed height.
+        table.setWordWrap(False)
+        base_height = table.fontMetrics().height() + 8
+        vertical_header = table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(base_height)
+
+        # Make first column slightly narrower (about 25% less than before)
+        table.setColumnWidth(0, 270)
+
+        header_height = table.horizontalHeader().height() if table.horizontalHeader().isVisible() else 0
+        total_height = header_height + 2 * table.frameWidth() + base_height * len(rows)
+        # The table always shows all its rows and is read-only, so it needs
+        # neither scroll bars nor focus and selection handling
+        table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        table.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        table.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        table.setMinimumHeight(total_height)
+        table.setMaximumHeight(total_height)
+
+        return table
     
+    def _on_csv_button_clicked(self) -> None:
+        """Show CSV content of the scenario field the clicked button refers to"""
+        button = self.sender()
+        csv_field = button.property("csv_field")
+        scenario = self.scenarios[button.property("scenario_index")]
+        self._show_csv_content(getattr(scenario, csv_field), self._field_descriptions[csv_field])
+
     def _show_csv_content(self, content: str, title: str) -> None:
         """Show CSV content in a separate dialog"""
-        dialog = QDialog(self)
-        dialog.setWindowTitle(title)
-        dialog.setMinimumSize(900, 600)
-        
-        layout = QVBoxLayout()
-        dialog.setLayout(layout)
-        
-        text_edit = QTextEdit()
-        text_edit.setPlainText(content)
-        text_edit.setReadOnly(True)
-        layout.addWidget(text_edit)
-        
-        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
-        buttons.rejected.connect(dialog.reject)
-        layout.addWidget(buttons)
-        
-        dialog.exec()
+        # One viewer is reused for all Show Content buttons of the dialog
+        if self._csv_content_dialog is None:
+            self._csv_content_dialog = CSVContentDialog(self.t, self)
+        self._csv_content_dialog.set_content(content, title)
+        self._csv_content_dialog.exec()
+        # Release the text document until the next preview
+        self._csv_content_dialog.clear_content()
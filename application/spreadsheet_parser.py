@@ -1,9 +1,10 @@
 """Spreadsheet parser module for parsing Excel files and creating Item objects"""
 
+import functools
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import openpyxl
 from openpyxl import load_workbook
@@ -11,6 +12,30 @@ from openpyxl import load_workbook
 from application.translations import TRANSLATIONS
 
 
+# Patterns used while parsing spreadsheet columns, compiled once at import time
+_EDI_INFO_PAIR_RE = re.compile(r'(\S+):\s*([^:]+?)(?=\s*\S+:|$)')
+# One pass over the EDI info text; alternatives are tried in order:
+#   P0401 -> P0 typo form of PO4 + 01
+#   SEGNN (SEGMM = QUAL) / SEGNN (QUAL) -> segment with digits and a qualifier
+#   SEGNN -> plain segment with digits
+_EDI_INFO_RE = re.compile(
+    r'^(?:'
+    r'P0(?P<p0_digit>\d)(?P<p0_el>\d{2})'
+    r'|(?P<seg>\S+?)(?P<digits>\d+)\s*\(\s*(?:\S+?\d+\s*=\s*)?(?P<qual>[A-Za-z0-9]+)\s*\)'
+    r'|(?P<plain_seg>[A-Za-z]+)(?P<plain_digits>\d+)'
+    r')$'
+)
+_N104_N101_N103_RE = re.compile(
+    r'^N104\s*\(\s*N101\s*=\s*([A-Za-z0-9]+)\s+and\s+N103\s*=\s*([A-Za-z0-9]+)\s*\)$',
+    re.IGNORECASE,
+)
+_N104_N103_RE = re.compile(r'^N104\s*\(\s*N103\s*=\s*([A-Za-z0-9]+)\s*\)$', re.IGNORECASE)
+_MIN_VALUE_RE = re.compile(r'min\s*=\s*(\d+)', re.IGNORECASE)
+_MAX_VALUE_RE = re.compile(r'max\s*=\s*(\d+)', re.IGNORECASE)
+_MIN_KEYWORD_RE = re.compile(r'min\s*=', re.IGNORECASE)
+_MAX_KEYWORD_RE = re.compile(r'max\s*=', re.IGNORECASE)
+
+
 @dataclass(frozen=True)
 class SourceFromTLIPath:
     """Represents a row from order_path_properties table."""
@@ -78,6 +103,70 @@ class Item:
     
     # Parsing errors
     parsing_errors: List[str] = field(default_factory=list)
+
+    # RSX data precomputed by precompute_rsx_data() for the RSX generators
+    rsx_855_sub_parts: Tuple[str, ...] = field(default=(), repr=False, compare=False)
+    rsx_856_sub_parts: Tuple[str, ...] = field(default=(), repr=False, compare=False)
+    rsx_810_sub_parts: Tuple[str, ...] = field(default=(), repr=False, compare=False)
+    rsx_856_order_sub_parts: Tuple[str, ...] = field(default=(), repr=False, compare=False)
+    has_sequential_number: bool = field(default=False, repr=False, compare=False)
+    tli_value_segments: Tuple[str, ...] = field(default=(), repr=False, compare=False)
+
+    def precompute_rsx_data(self) -> None:
+        """
+        Precompute RSX path parts and TLI value flags used on every generated line
+
+        Detail paths are stored relative to their repeating container
+        (LineItem for 855/810, ItemLevel for 856), so RSX generators do not
+        split the same path for each LineItem/ItemLevel.
+        """
+        self.rsx_855_sub_parts = Item.rsx_sub_parts(self.rsx_path_855, "LineItem")
+        self.rsx_856_sub_parts = Item.rsx_sub_parts(self.rsx_path_856, "ItemLevel")
+        self.rsx_810_sub_parts = Item.rsx_sub_parts(self.rsx_path_810, "LineItem")
+        if "OrderLevel" in Item.rsx_path_parts(self.rsx_path_856):
+            self.rsx_856_order_sub_parts = Item.rsx_sub_parts(self.rsx_path_856, "OrderLevel")
+        else:
+            self.rsx_856_order_sub_parts = ()
+        # tli_value split around {sequential_number}, joined back with the line number
+        self.tli_value_segments = tuple(self.tli_value.split("{sequential_number}"))
+        self.has_sequential_number = len(self.tli_value_segments) > 1
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def rsx_path_parts(rsx_path: str) -> Tuple[str, ...]:
+        """
+        Split RSX path into tag parts, once per distinct path
+
+        Args:
+            rsx_path: RSX path joined with "_" (e.g. OrderAck_LineItem_OrderLine_OrderQty)
+
+        Returns:
+            Tuple of path parts
+        """
+        return tuple(rsx_path.split("_"))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def rsx_sub_parts(rsx_path: str, container: str) -> Tuple[str, ...]:
+        """
+        Split RSX path and return the parts that follow the container element
+
+        Args:
+            rsx_path: RSX path joined with "_" (e.g. OrderAck_LineItem_OrderLine_OrderQty)
+            container: Name of the container element (e.g. LineItem)
+
+        Returns:
+            Tuple of path parts after the container, or all parts if the
+            container is not part of the path
+        """
+        if not rsx_path:
+            return ()
+        parts = Item.rsx_path_parts(rsx_path)
+        try:
+            idx = parts.index(container)
+        except ValueError:
+            return parts
+        return parts[idx + 1 :]
     
     @staticmethod
     def clear_edi_info(line: str) -> str:
@@ -92,17 +181,43 @@ class Item:
         """
         line = line.strip()
         
-        # If there is no colon, this is a simple value
-        if ":" not in line:
+        # If there is no colon or no 850 key can be present, this is a simple value
+        if ":" not in line or "850" not in line:
             return line
         
+        # Fast path for the usual "850: PO107 (VN) 855: PO102" layout: every key is a
+        # whitespace-separated "KEY:" token followed by at least one value token
+        pos = 0
+        value_start = None
+        previous_is_key = False
+        for token in line.split():
+            token_start = line.find(token, pos)
+            pos = token_start + len(token)
+            colon = token.find(":")
+            if colon == -1:
+                previous_is_key = False
+                continue
+            if value_start is not None:
+                if not previous_is_key and ":" in token[1:]:
+                    # Value of the 850 key ends at the next key
+                    return line[value_start:token_start].strip()
+                break
+            if colon != len(token) - 1 or colon == 0 or previous_is_key:
+                # Unusual layout, leave it to the regex below
+                break
+            if "850" in token:
+                value_start = pos
+            previous_is_key = True
+        else:
+            if value_start is None:
+                return line
+            if not previous_is_key:
+                return line[value_start:].strip()
+        
         # Find all keys and their values
         # Key = non-whitespace characters followed by ':' and spaces
         # Value = everything until the next key or end of line
-        pairs = re.findall(
-            r'(\S+):\s*([^:]+?)(?=\s*\S+:|$)',
-            line
-        )
+        pairs = _EDI_INFO_PAIR_RE.findall(line)
         
         for key, value in pairs:
             if "850" in key:
@@ -124,6 +239,31 @@ class Item:
             return "PO" + seg[2:]
         return seg
     
+    @staticmethod
+    def _split_seg_el(seg_part: str, digits: str) -> Tuple[str, str]:
+        """
+        Split segment part and trailing digits into (edi_segment, edi_element_number)
+
+        - 3 or more digits: the first digit belongs to the segment, the last 2 are the element
+          number (N403 -> N4, 03)
+        - 2 digits: a segment longer than 1 character is complete (PID05 -> PID, 05),
+          otherwise the first digit goes to the segment (N45 -> N4, 05)
+        - 1 digit: it is the element number and the segment stays unchanged (N4 -> N, 04)
+        """
+        if len(digits) >= 3:
+            seg = seg_part + digits[0]
+            el = digits[-2:]
+        elif len(digits) == 2 and len(seg_part) > 1:
+            seg = seg_part
+            el = digits
+        elif len(digits) == 2:
+            seg = seg_part + digits[0]
+            el = digits[1].zfill(2)
+        else:
+            seg = seg_part
+            el = digits.zfill(2)
+        return Item.normalize_segment(seg), el
+
     @staticmethod
     def parse_edi_info(text: str) -> Tuple[str, str, str]:
         """
@@ -140,133 +280,37 @@ class Item:
         if not text:
             return "", "", ""
 
+        # Plain SEGNN values (the most common form) are split with str methods,
+        # everything else goes through the regex below
+        seg_end = len(text.rstrip("0123456789"))
+        seg_part, digits = text[:seg_end], text[seg_end:]
+        if digits and seg_part.isascii() and seg_part.isalpha():
+            if seg_part == "P" and len(digits) == 4 and digits[0] == "0":
+                # P0401 -> PO4, 01
+                return f"PO{digits[1]}", digits[2:], ""
+            seg, el = Item._split_seg_el(seg_part, digits)
+            return seg, el, ""
+
+        m = _EDI_INFO_RE.match(text)
+        if not m:
+            # Nothing matched → return empty fields
+            return "", "", ""
+
         # Special handling for values like P0401, P0402, P0101, etc.
         # P0401 -> seg = PO4, el = 01; P0101 -> PO1, 01; P0402 -> PO4, 02, etc.
-        m = re.match(r'^P0(\d)(\d{2})$', text)
-        if m:
-            seg_digit, el = m.groups()
-            seg = f"PO{seg_digit}"
-            return seg, el, ""
-        
-        # Format: SEGNN (SEGMM = QUAL)
-        m = re.match(r'^(\S+?)(\d+)\s*\(\s*(\S+?)(\d+)\s*=\s*([A-Za-z0-9]+)\s*\)$', text)
-        if m:
-            seg_part, digits, qseg, qel, qual = m.groups()
-            # If the element number has 3 or more digits, the first digit belongs to the segment
-            if len(digits) >= 3:
-                # Take the first digit for the segment and the last 2 for the element number
-                # For example, N403 -> seg = N4, el = 03
-                seg = seg_part + digits[0]
-                el = digits[-2:]  # Last 2 digits
-            elif len(digits) == 2:
-                # If there are 2 digits, check the segment length
-                # If the segment is longer than 1 character (e.g. PID, N1, N2), the segment is complete
-                #   and both digits are the element number
-                # If the segment is 1 character (e.g. N), the first digit goes to the segment, the second to the element number
-                if len(seg_part) > 1:
-                    # Segment is complete, both digits are the element number
-                    # For example, PID05 (PID02=08) -> seg = PID, el = 05
-                    seg = seg_part
-                    el = digits.zfill(2)
-                else:
-                    # Segment is 1 character, the first digit goes to the segment
-                    # For example, N45 (N402=08) -> seg = N4, el = 05
-                    seg = seg_part + digits[0]
-                    el = digits[1].zfill(2)
-            else:
-                # If there is 1 digit, it goes to the element number
-                seg = seg_part
-                el = digits.zfill(2)
-            seg = Item.normalize_segment(seg)
-            return seg, el, qual
-        
-        # Format: SEGNN (QUAL)
-        m = re.match(r'^(\S+?)(\d+)\s*\(\s*([A-Za-z0-9]+)\s*\)$', text)
-        if m:
-            seg_part, digits, qual = m.groups()
-            # If the element number has 3 or more digits, the first digit belongs to the segment
-            if len(digits) >= 3:
-                # Take the first digit for the segment and the last 2 for the element number
-                # For example, N403 -> seg = N4, el = 03
-                seg = seg_part + digits[0]
-                el = digits[-2:]  # Last 2 digits
-            elif len(digits) == 2:
-                # If there are 2 digits, check the segment length
-                # If the segment is longer than 1 character (e.g. PID, N1, N2), the segment is complete
-                #   and both digits are the element number
-                # If the segment is 1 character (e.g. N), the first digit goes to the segment, the second to the element number
-                if len(seg_part) > 1:
-                    # Segment is complete, both digits are the element number
-                    # For example, PID05 (08) -> seg = PID, el = 05
-                    seg = seg_part
-                    el = digits.zfill(2)
-                else:
-                    # Segment is 1 character, the first digit goes to the segment
-                    # For example, N45 (08) -> seg = N4, el = 05
-                    seg = seg_part + digits[0]
-                    el = digits[1].zfill(2)
-            else:
-                # If there is 1 digit, it goes to the element number
-                seg = seg_part
-                el = digits.zfill(2)
-            seg = Item.normalize_segment(seg)
+        p0_digit = m.group("p0_digit")
+        if p0_digit is not None:
+            return f"PO{p0_digit}", m.group("p0_el"), ""
+
+        # Format: SEGNN (SEGMM = QUAL) or SEGNN (QUAL)
+        qual = m.group("qual")
+        if qual is not None:
+            seg, el = Item._split_seg_el(m.group("seg"), m.group("digits"))
             return seg, el, qual
-        
-        # Format: SEGNN (for example N404 -> N4, 04)
-        # First try to find a segment that already ends with a digit (for example N4, PO1)
-        # If the element number has more than 2 digits, take the last 2
-        # Important: this pattern should trigger only if the element number has 2 or more digits
-        # to avoid parsing "PID05" incorrectly as "PID0" + "5"
-        m = re.match(r'^([A-Za-z]+\d)(\d{2,})$', text)
-        if m:
-            seg, el = m.groups()
-            seg = Item.normalize_segment(seg)
-            # Limit edi_element_number to 2 digits (take the last 2)
-            # For example, N404 -> N4, 04 (last 2 digits from 404)
-            el = el[-2:].zfill(2) if len(el) > 2 else el.zfill(2)
-            return seg, el, ""
-        
-        # Format: SEGNN (when the segment has no trailing digit, for example N404 where N is the segment and 404 is the number)
-        # But if the number has 3 or more digits, it may actually be N4 + 04
-        m = re.match(r'^([A-Za-z]+)(\d+)$', text)
-        if m:
-            seg_part, digits = m.groups()
-            # Special generic case for values like P0401, P0101, etc.
-            # P0401 -> seg = PO4, el = 01; P0101 -> PO1, 01; P0402 -> PO4, 02, etc.
-            if seg_part == "P" and len(digits) >= 3 and digits[0] == "0":
-                seg = "PO" + digits[1]
-                el = digits[-2:].zfill(2)
-            # General logic for other segments
-            elif len(digits) >= 3:
-                # Take the first digit for the segment and the last 2 for the element number
-                # For example, N404 -> seg = N4, el = 04
-                seg = seg_part + digits[0]
-                el = digits[-2:]  # Last 2 digits
-            elif len(digits) == 2:
-                # If there are 2 digits, check the segment length
-                # If the segment is longer than 1 character (e.g. PID, N1, N2), the segment is complete
-                #   and both digits are the element number
-                # If the segment is 1 character (e.g. N), the first digit goes to the segment, the second to the element number
-                if len(seg_part) > 1:
-                    # Segment is complete, both digits are the element number
-                    # For example, PID05 -> seg = PID, el = 05
-                    seg = seg_part
-                    el = digits.zfill(2)
-                else:
-                    # Segment is 1 character, the first digit goes to the segment
-                    # For example, N45 -> seg = N4, el = 05
-                    seg = seg_part + digits[0]
-                    el = digits[1].zfill(2)
-            else:
-                # If there is 1 digit, it goes to the element number but the segment stays unchanged
-                # For example, N4 -> seg = N, el = 04
-                seg = seg_part
-                el = digits.zfill(2)
-            seg = Item.normalize_segment(seg)
-            return seg, el, ""
-        
-        # Nothing matched → return empty fields
-        return "", "", ""
+
+        # Format: SEGNN (for example N404 -> N4, 04; PID05 -> PID, 05; N4 -> N, 04)
+        seg, el = Item._split_seg_el(m.group("plain_seg"), m.group("plain_digits"))
+        return seg, el, ""
 
 
 class SpreadsheetParser:
@@ -298,12 +342,30 @@ class SpreadsheetParser:
         all_errors: List[str] = []
         
         try:
-            # Load workbook
-            workbook = load_workbook(file_path, data_only=True)
-            sheet = workbook.active
+            # Load workbook in read-only mode: only rows 1-5 are needed, so the
+            # sheet is streamed instead of being loaded with all cell objects
+            workbook = load_workbook(file_path, data_only=True, read_only=True)
+            try:
+                sheet = workbook.active
+                # Read-only mode trusts the dimension stored in the file, which some
+                # tools write incorrectly, so rows are read up to their real last cell
+                sheet.reset_dimensions()
+                header_rows = list(sheet.iter_rows(min_row=1, max_row=5, values_only=True))
+                max_col = max((len(row) for row in header_rows), default=0)
+            finally:
+                workbook.close()
             
-            # Get max column (starting from column B = 2)
-            max_col = sheet.max_column
+            # Pad rows 1-5 to the full width, trailing empty rows/cells are not returned
+            empty_row = (None,) * max_col
+            header_rows = [tuple(row) + empty_row[len(row):] for row in header_rows]
+            header_rows += [empty_row] * (5 - len(header_rows))
+            
+            # Load item, sourcing group and order path properties once for all columns
+            db_index = self._build_db_index(self.database.get_all_items())
+            sourcing_groups = {
+                row["sourcing_group_properties_id"]: row for row in self.database.get_all_sourcing_groups()
+            }
+            order_paths = {row["order_path_properties_id"]: row for row in self.database.get_all_order_paths()}
             
             # Iterate through columns starting from B (index 2)
             for col_idx in range(2, max_col + 1):
@@ -311,11 +373,9 @@ class SpreadsheetParser:
                 column_errors = []
                 
                 # Get values from rows 1-5
-                row1_value = self._get_cell_value(sheet, 1, col_idx)
-                row2_value = self._get_cell_value(sheet, 2, col_idx)
-                row3_value = self._get_cell_value(sheet, 3, col_idx)
-                row4_value = self._get_cell_value(sheet, 4, col_idx)
-                row5_value = self._get_cell_value(sheet, 5, col_idx)
+                row1_value, row2_value, row3_value, row4_value, row5_value = (
+                    self._get_cell_value(row[col_idx - 1]) for row in header_rows
+                )
                 
                 # Row 1: spreadsheet_label (required)
                 if not row1_value or str(row1_value).strip() == "":
@@ -387,11 +447,7 @@ class SpreadsheetParser:
 
                 if cleared_text:
                     # Case 1: N104 (N101=VN and N103=92) -> segment N1, element 04, qualifier taken from N101
-                    m = re.match(
-                        r'^N104\s*\(\s*N101\s*=\s*([A-Za-z0-9]+)\s+and\s+N103\s*=\s*([A-Za-z0-9]+)\s*\)$',
-                        cleared_text,
-                        re.IGNORECASE,
-                    )
+                    m = _N104_N101_N103_RE.match(cleared_text)
                     if m:
                         qual_from_n101 = m.group(1).strip()
                         item.edi_segment = "N1"
@@ -400,11 +456,7 @@ class SpreadsheetParser:
                         special_n104_handled = True
                     else:
                         # Case 2: N104 (N103=92) -> segment N1, element 04, qualifier is inherited
-                        m = re.match(
-                            r'^N104\s*\(\s*N103\s*=\s*([A-Za-z0-9]+)\s*\)$',
-                            cleared_text,
-                            re.IGNORECASE,
-                        )
+                        m = _N104_N103_RE.match(cleared_text)
                         if m:
                             # Take the previous Item if it exists
                             if items and items[-1].edi_segment == "N1":
@@ -447,15 +499,15 @@ class SpreadsheetParser:
                 
                 # Match with database
                 if item.edi_segment and item.edi_element_number:
-                    match_errors = self._match_with_database(item, col_idx)
+                    match_errors = self._match_with_database(
+                        item, col_idx, db_index, sourcing_groups, order_paths
+                    )
                     column_errors.extend(match_errors)
                     all_errors.extend(match_errors)
                 
                 item.parsing_errors = column_errors
                 items.append(item)
             
-            workbook.close()
-            
             # Check if parsing was successful
             success = len(all_errors) == 0
             error_message = "\n".join(all_errors) if all_errors else None
@@ -465,12 +517,12 @@ class SpreadsheetParser:
         except Exception as e:
             return [], False, f"{self.t['error_read_file']}: {str(e)}"
     
-    def _get_cell_value(self, sheet, row: int, col: int) -> Optional[str]:
+    @staticmethod
+    def _get_cell_value(value) -> Optional[str]:
         """Get cell value as string"""
-        cell = sheet.cell(row=row, column=col)
-        if cell.value is None:
+        if value is None:
             return None
-        return str(cell.value)
+        return str(value)
     
     def _column_letter(self, col_idx: int) -> str:
         """Convert column index to letter (1=A, 2=B, etc.)"""
@@ -482,12 +534,12 @@ class SpreadsheetParser:
         text = item.spreadsheet_min_max_text.strip()
         
         # Format: "min=1, max=50" or similar
-        min_match = re.search(r'min\s*=\s*(\d+)', text, re.IGNORECASE)
-        max_match = re.search(r'max\s*=\s*(\d+)', text, re.IGNORECASE)
+        min_match = _MIN_VALUE_RE.search(text)
+        max_match = _MAX_VALUE_RE.search(text)
         
         # Check if text contains min= or max= keywords (field is optional, so only validate if keywords are present)
-        has_min_keyword = bool(re.search(r'min\s*=', text, re.IGNORECASE))
-        has_max_keyword = bool(re.search(r'max\s*=', text, re.IGNORECASE))
+        has_min_keyword = bool(_MIN_KEYWORD_RE.search(text))
+        has_max_keyword = bool(_MAX_KEYWORD_RE.search(text))
         
         if min_match:
             try:
@@ -521,13 +573,36 @@ class SpreadsheetParser:
         
         return errors
     
-    def _match_with_database(self, item: Item, col_idx: int) -> List[str]:
+    @staticmethod
+    def _build_db_index(db_items: List[dict]) -> Dict[Tuple[str, int, str], List[dict]]:
+        """Index database items by (edi_segment, edi_element_number, edi_qualifier)"""
+        db_index: Dict[Tuple[str, int, str], List[dict]] = {}
+        for db_item in db_items:
+            # Normalize element numbers for comparison (convert to int)
+            # Database stores as INTEGER (e.g., 2), parser returns as string with leading zeros (e.g., "02")
+            db_element_raw = db_item.get("edi_element_number", "")
+            try:
+                db_element_int = int(db_element_raw) if db_element_raw != "" else None
+            except (ValueError, TypeError):
+                db_element_int = None
+            # Items without a numeric element number can never match parsed EDI info
+            if db_element_int is None:
+                continue
+            key = (db_item.get("edi_segment", ""), db_element_int, db_item.get("edi_qualifier") or "")
+            db_index.setdefault(key, []).append(db_item)
+        return db_index
+    
+    def _match_with_database(
+        self,
+        item: Item,
+        col_idx: int,
+        db_index: Dict[Tuple[str, int, str], List[dict]],
+        sourcing_groups: Dict[int, dict],
+        order_paths: Dict[int, dict],
+    ) -> List[str]:
         """Match item with database records"""
         errors = []
         
-        # Get all items from database
-        db_items = self.database.get_all_items()
-        
         # Normalize edi_element_number for matching
         edi_element_num = item.edi_element_number
         
@@ -540,30 +615,11 @@ class SpreadsheetParser:
                 # If edi_element_number is not a valid number, keep original value
                 pass
         
-        # Find matches
-        matches = []
-        for db_item in db_items:
-            db_segment = db_item.get("edi_segment", "")
-            db_element_raw = db_item.get("edi_element_number", "")
-            db_qualifier = db_item.get("edi_qualifier") or ""
-            item_qualifier = item.edi_qualifier or ""
-            
-            # Normalize element numbers for comparison (convert both to int)
-            # Database stores as INTEGER (e.g., 2), parser returns as string with leading zeros (e.g., "02")
-            try:
-                db_element_int = int(db_element_raw) if db_element_raw != "" else None
-                item_element_int = int(edi_element_num) if edi_element_num else None
-                element_match = db_element_int == item_element_int if (db_element_int is not None and item_element_int is not None) else False
-            except (ValueError, TypeError):
-                # If conversion fails, fall back to string comparison
-                db_element = str(db_element_raw)
-                element_match = db_element == edi_element_num
-            
-            if db_segment == item.edi_segment and element_match:
-                # Match qualifier if both are present, or if both are empty
-                if (db_qualifier and item_qualifier and db_qualifier == item_qualifier) or \
-                   (not db_qualifier and not item_qualifier):
-                    matches.append(db_item)
+        # Find matches: qualifiers must be equal if both are present, or both must be empty
+        try:
+            matches = db_index.get((item.edi_segment, int(edi_element_num), item.edi_qualifier or ""), [])
+        except ValueError:
+            matches = []
         
         if len(matches) == 0:
             errors.append(
@@ -596,18 +652,19 @@ class SpreadsheetParser:
             item.put_in_855 = bool(match.get("put_in_855_by_default", False))
             item.put_in_856 = bool(match.get("put_in_856_by_default", False))
             item.put_in_810 = bool(match.get("put_in_810_by_default", False))
+            item.precompute_rsx_data()
 
             # Get sourcing group and order path info
             sourcing_group_id = match.get("sourcing_group_properties_id")
             if sourcing_group_id:
-                sg_row = self.database.get_sourcing_group(sourcing_group_id)
+                sg_row = sourcing_groups.get(sourcing_group_id)
                 if sg_row:
                     order_path_id = sg_row.get("order_path_properties_id")
                     source_path_obj: Optional[SourceFromTLIPath] = None
 
                     if order_path_id:
                         item.order_path_properties_id = order_path_id
-                        op_row = self.database.get_order_path(order_path_id)
+                        op_row = order_paths.get(order_path_id)
                         if op_row:
                             source_path_obj = SourceFromTLIPath(
                                 order_path_properties_id=op_row.get("order_path_properties_id"),
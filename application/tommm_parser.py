@@ -30,6 +30,8 @@ class InboundDocScenario:
     is_consolidated: bool = False
     csv_design_filename: str = ""
     csv_design: str = ""
+    # csv_design split into CSV rows (set together with csv_design)
+    csv_rows: List[List[str]] = field(default_factory=list, repr=False)
     csv_test_file: str = ""
     
     # Parsing errors
@@ -226,6 +226,8 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "scenario_csv_design": "CSV дизайн",
         "scenario_csv_test_file": "CSV тестовий файл",
         "show_content": "Показати зміст",
+        "previous_page": "Попередня",
+        "next_page": "Наступна",
         "show_sourcing_group_info": "Показати інформацію групи до якої належить item",
         "sourcing_group_info_title": "Інформація про групу для Item",
         "show_items_info": "Показати інформацію TLI полів",
@@ -468,6 +470,8 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "scenario_csv_design": "CSV design",
         "scenario_csv_test_file": "CSV test file",
         "show_content": "Show Content",
+        "previous_page": "Previous",
+        "next_page": "Next",
         # Artifact generation section
         "create_artifacts": "Generate Artifacts",
         "gen_xtl_850": "Generate poRsxRead.xtl (850 document)",